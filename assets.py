@@ -0,0 +1,226 @@
+# Baked sprite bundle: bake step and runtime loader
+#
+# The source PNGs are several megabytes each but the games only ever draw
+# them at 40-300px. `python assets.py` scales every sprite the games use to
+# its on-screen size once, packs them into one atlas plus a JSON manifest
+# under images/baked/, and load_image() serves them from there, converted
+# to the display format once. Anything missing from the bundle falls back
+# to loading and scaling the source image as before.
+
+import json
+import os
+import queue
+import sys
+import threading
+
+import pygame
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+IMAGE_PATH = os.path.join(BASE_PATH, "images")
+BAKED_PATH = os.path.join(IMAGE_PATH, "baked")
+MANIFEST_FILE = "manifest.json"
+ATLAS_FILE = "sprites.png"
+ATLAS_WIDTH = 1024
+
+# (source image, (width, height), opaque) for every sprite the games draw.
+# A width of None keeps the aspect ratio for the given height. Opaque
+# images are baked to their own file instead of the alpha atlas.
+BUNDLE = [
+    # specialdaydodger.py
+    ("flowers.png", (100, 100), False),
+    ("spreadsheet.png", (50, 50), False),
+    ("invitation.png", (60, 60), False),
+    ("rings.png", (40, 40), False),
+    ("tux.png", (100, 100), False),
+    ("list.png", (50, 50), False),
+    ("maddievillain.png", (200, 200), False),
+    ("andreas.png", (100, 100), False),
+    ("dodgebg.png", (800, 600), True),
+    # main.py
+    ("spreadsheet.png", (60, 60), False),
+    # maddiepaddy.py
+    ("maddiesadre.png", (None, 80), False),
+    ("andreasrev.png", (None, 80), False),
+    ("Andymaddie_hug.png", (300, 300), False),
+]
+
+
+def bundle_key(name, size):
+    w, h = size
+    return f"{name}@{'_' if w is None else w}x{h}"
+
+def scale_source(name, size):
+    raw = pygame.image.load(os.path.join(IMAGE_PATH, name))
+    w, h = size
+    if w is None:
+        factor = h / raw.get_height()
+        w = int(raw.get_width() * factor)
+    return pygame.transform.scale(raw, (w, h))
+
+def convert(surface, alpha=True):
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+# --- Bake ---
+def bake(bundle=BUNDLE, out_path=BAKED_PATH):
+    """Scale every bundle entry and write the atlas, opaque images and manifest."""
+    os.makedirs(out_path, exist_ok=True)
+    sprites, images = {}, {}
+    alpha_entries = []
+    for name, size, opaque in bundle:
+        key = bundle_key(name, size)
+        surface = scale_source(name, size)
+        if opaque:
+            file = key.replace("@", "_").replace(".png", "") + ".png"
+            pygame.image.save(surface, os.path.join(out_path, file))
+            images[key] = file
+        else:
+            alpha_entries.append((key, surface))
+
+    # Shelf packing, tallest first
+    alpha_entries.sort(key=lambda e: e[1].get_height(), reverse=True)
+    x = y = shelf = 0
+    for key, surface in alpha_entries:
+        w, h = surface.get_size()
+        if x + w > ATLAS_WIDTH:
+            x, y, shelf = 0, y + shelf, 0
+        sprites[key] = [x, y, w, h]
+        x, shelf = x + w, max(shelf, h)
+    atlas = pygame.Surface((ATLAS_WIDTH, y + shelf), pygame.SRCALPHA)
+    for key, surface in alpha_entries:
+        # Copy pixels as-is rather than alpha-blending them onto the empty atlas
+        atlas.blit(surface.convert_alpha(), sprites[key][:2], special_flags=pygame.BLEND_RGBA_MAX)
+    pygame.image.save(atlas, os.path.join(out_path, ATLAS_FILE))
+
+    with open(os.path.join(out_path, MANIFEST_FILE), "w") as f:
+        json.dump({"atlas": ATLAS_FILE, "sprites": sprites, "images": images}, f, indent=2, sort_keys=True)
+    return sprites, images
+
+
+# --- Runtime loader ---
+class SpriteBundle:
+    """Serves baked sprites as subsurfaces of one converted atlas.
+
+    preload() does the file reads and PNG decoding and is safe to run on a
+    loader thread; image() converts to the display format on first use.
+    """
+
+    def __init__(self, path=BAKED_PATH):
+        self.path = path
+        self.manifest = None
+        self.atlas = None
+        self.raw = {}
+
+    def load_manifest(self):
+        if self.manifest is None:
+            try:
+                with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+                    self.manifest = json.load(f)
+            except (OSError, ValueError):
+                self.manifest = {"sprites": {}, "images": {}}
+        return self.manifest
+
+    def load_file(self, file):
+        if file not in self.raw:
+            self.raw[file] = pygame.image.load(os.path.join(self.path, file))
+        return self.raw[file]
+
+    def preload(self):
+        manifest = self.load_manifest()
+        if manifest["sprites"]:
+            self.load_file(manifest["atlas"])
+        for file in manifest["images"].values():
+            self.load_file(file)
+
+    def image(self, name, size, alpha=True):
+        key = bundle_key(name, size)
+        manifest = self.load_manifest()
+        if key in manifest["images"]:
+            file = manifest["images"][key]
+            surface = convert(self.load_file(file), alpha)
+            self.raw.pop(file, None)
+            return surface
+        if key in manifest["sprites"]:
+            if self.atlas is None:
+                self.atlas = convert(self.load_file(manifest["atlas"]))
+                self.raw.pop(manifest["atlas"], None)
+            return self.atlas.subsurface(manifest["sprites"][key])
+        return convert(scale_source(name, size), alpha)
+
+
+bundle = SpriteBundle()
+
+def load_image(name, size, alpha=True):
+    """`name` from images/ at `size`, from the baked bundle when it has it."""
+    return bundle.image(name, size, alpha)
+
+
+# --- Background loading ---
+class AssetLoader:
+    """Runs loading jobs in the background and hands the results back.
+
+    Each job is a `load()` callable, run on a worker thread, and an optional
+    `finish(value)` callable, run on the main thread from poll(). Where
+    threads are unavailable (pygbag) poll() instead runs one pending load
+    per call, so calling it once per frame keeps the window responsive.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.results = queue.SimpleQueue()
+        self.total = self.finished = 0
+        self.threaded = sys.platform != "emscripten"
+        self.started = False
+
+    def add(self, load, finish=None):
+        self.jobs.append((load, finish))
+        self.total += 1
+
+    def start(self):
+        if self.threaded and not self.started:
+            threading.Thread(target=self.work, daemon=True).start()
+        self.started = True
+
+    def run(self, load, finish):
+        try:
+            self.results.put((finish, load(), None))
+        except Exception as e:
+            self.results.put((finish, None, e))
+
+    def work(self):
+        while self.jobs:
+            self.run(*self.jobs.pop(0))
+
+    def poll(self):
+        """Finish any completed jobs; returns True once everything is loaded."""
+        if not self.started:
+            self.start()
+        if not self.threaded and self.jobs:
+            self.run(*self.jobs.pop(0))
+        while not self.results.empty():
+            finish, value, error = self.results.get()
+            if error is None and finish:
+                try:
+                    finish(value)
+                except Exception as e:
+                    error = e
+            if error is not None:
+                print(f"Asset load error: {error}")
+            self.finished += 1
+        return self.done()
+
+    def done(self):
+        return self.finished == self.total
+
+    def progress(self):
+        return self.finished / self.total if self.total else 1.0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    sprites, images = bake()
+    print(f"Baked {len(sprites)} sprites and {len(images)} images into {BAKED_PATH}")
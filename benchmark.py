@@ -0,0 +1,298 @@
+# Headless benchmark scenarios for the dodger and the maze
+#
+#   python benchmark.py [--frames N] [--only NAME ...] [--out results.json]
+#                       [--save-baseline FILE] [--baseline FILE] [--tolerance 0.2]
+#
+# Every scenario runs a fixed number of frames with a fixed seed and scripted
+# input under the SDL dummy video driver, stepping the simulation once per
+# frame and drawing it the way the games do. Results (frames/sec, per-phase
+# timings from the profiler and allocation counts) are printed as JSON. With
+# --baseline, each scenario's median frames/sec is compared against a stored run
+# and the exit status is 1 if any dropped by more than the tolerance.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+from collections import deque
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# Keep stdout pure JSON
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from assets import BASE_PATH, load_image
+from dodger_sim import DodgerSim, SCREEN_WIDTH, SCREEN_HEIGHT, FIRE, UP, DOWN
+from lighting import Lighting
+from maze import MazeTiles, WalkGrid
+from profiler import Profiler
+from render import DirtyRenderer
+from sprites import darkened
+from text_cache import text_cache
+
+SEED = 1234
+DEFAULT_FRAMES = 600
+STRESS_OBSTACLES = 500
+SIM_METHODS = ("update_laser", "spawn_obstacle", "update_obstacles", "check_collisions")
+
+# Maze constants as in maddiepaddy.py
+TILE_SIZE, ZOOM, PLAYER_SPEED = 10, 3, 10
+MADDIE_SIZE = int(TILE_SIZE * 2.6 * ZOOM)
+
+SCENARIOS = {}
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+class BenchSim(DodgerSim):
+    """DodgerSim that does all the collision work but never crashes."""
+
+    def check_collisions(self):
+        super().check_collisions()
+        return False
+
+
+def get_font(size):
+    try:
+        return pygame.font.Font(os.path.join(BASE_PATH, "fonts", "smallest_pixel-7.ttf"), size)
+    except Exception:
+        return pygame.font.SysFont(None, size)
+
+
+# --- Dodger ---
+def run_dodger(frames, profiler, buttons=None, before=None, setup=None):
+    """specialdaydodger.py's frame: one sim step, dirty-rect draw, display update."""
+    screen = pygame.display.get_surface()
+    sizes = {**DodgerSim.OBJECT_SIZES, 'maddievillain': 200}
+    images = {name: load_image(f"{name}.png", (size, size)) for name, size in sizes.items()}
+    player = load_image("andreas.png", (DodgerSim.PLAYER_SIZE, DodgerSim.PLAYER_SIZE))
+    background = load_image("dodgebg.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+    font = get_font(24)
+    renderer = DirtyRenderer(screen, background)
+    lw, lh = DodgerSim.LASER_SIZE
+
+    sim = BenchSim(seed=SEED)
+    for method in SIM_METHODS:
+        profiler.wrap(sim, method)
+    if setup:
+        setup(sim)
+
+    for i in range(frames):
+        profiler.begin_frame()
+        pressed = buttons(sim, i) if buttons else 0
+        profiler.lap("input")
+        if before:
+            before(sim)
+        sim.step(pressed)
+        profiler.lap("simulation")
+
+        renderer.begin()
+        renderer.blit(player, (sim.player_x, sim.player_y))
+        for ox, oy, kind, _ in sim.obstacles:
+            renderer.blit(images[kind], (ox, oy))
+        if sim.laser:
+            renderer.rect((255, 0, 0), (sim.laser.x, sim.laser.y, lw, lh))
+            for j, (tx, ty) in enumerate(sim.laser_trail):
+                if j % 2 == 0:
+                    renderer.circle((255, 0, 0), (tx + lw // 2, ty + lh), 2)
+        if sim.maddie_visible():
+            renderer.blit(text_cache.render(font, "IT'S MY", (0, 0, 0)), (SCREEN_WIDTH - 270, 200))
+            renderer.blit(images['maddievillain'], (SCREEN_WIDTH - 220, SCREEN_HEIGHT // 2 - 100))
+        label = text_cache.render(font, "Tasks avoided: ", (0, 0, 0))
+        renderer.blit(label, (20, 20))
+        end = text_cache.draw_glyphs(screen, font, str(sim.tasks_avoided), (20 + label.get_width(), 20), (0, 0, 0))
+        renderer.mark(pygame.Rect(20, 20, end - 20, font.get_height()))
+        profiler.lap("draw")
+        renderer.end()
+        profiler.lap("display")
+        profiler.end_frame()
+
+@scenario
+def dodger_idle(frames, profiler):
+    run_dodger(frames, profiler)
+
+@scenario
+def dodger_boost(frames, profiler):
+    def boost(sim):
+        # Keep the special-day boost (faster spawns, Maddie on screen) going
+        now = sim.clock()
+        sim.maddie_display_time = now
+        sim.boost_end_time = now + 10
+        sim.spawn_rate = sim.BOOST_SPAWN_RATE
+    run_dodger(frames, profiler, before=boost)
+
+@scenario
+def dodger_stress(frames, profiler):
+    def fill(sim):
+        for i in range(STRESS_OBSTACLES):
+            kind = sim.rng.choice(sim.obstacles.kinds)
+            size = sim.OBJECT_SIZES[kind]
+            sim.obstacles.spawn(i * SCREEN_WIDTH / STRESS_OBSTACLES, sim.rng.randint(0, SCREEN_HEIGHT - size), kind, size)
+
+    def top_up(sim):
+        while len(sim.obstacles) < STRESS_OBSTACLES:
+            sim.spawn_obstacle()
+    run_dodger(frames, profiler, before=top_up, setup=fill)
+
+@scenario
+def dodger_laser(frames, profiler):
+    # Fire whenever the laser is free, sweeping up and down the screen
+    run_dodger(frames, profiler, buttons=lambda sim, i: FIRE | (UP if i // 90 % 2 else DOWN))
+
+
+# --- Maze ---
+def maze_path(grid, start, goal, w, h):
+    """Shortest PLAYER_SPEED-step path from `start` until Maddie's centre is on `goal`."""
+    gx, gy = goal
+    def reached(x, y):
+        return gx <= x + w // 2 <= gx + w and gy <= y + h // 2 <= gy + h
+
+    came_from = {start: None}
+    queue = deque([start])
+    end = start
+    while queue:
+        x, y = pos = queue.popleft()
+        if reached(x, y):
+            end = pos
+            break
+        for dx, dy in ((PLAYER_SPEED, 0), (-PLAYER_SPEED, 0), (0, PLAYER_SPEED), (0, -PLAYER_SPEED)):
+            step = (x + dx, y + dy)
+            if step not in came_from and grid.is_walkable(*step, w, h):
+                came_from[step] = pos
+                queue.append(step)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = came_from[end]
+    return path[::-1]
+
+@scenario
+def maze_traversal(frames, profiler):
+    """maddiepaddy.py's frame while walking the shortest route from Maddie to Andreas."""
+    screen = pygame.display.get_surface()
+    raw = pygame.image.load(os.path.join(BASE_PATH, "images", "mazebgclippedpurpscare2.png"))
+    grid = WalkGrid(raw, ZOOM)
+    maze_tiles = MazeTiles(raw.convert(), ZOOM)
+    maddie = load_image("maddiesadre.png", (None, 80))
+    andreas = load_image("andreasrev.png", (None, 80))
+    w, h = maddie.get_size()
+    font = get_font(36)
+    lighting = Lighting((SCREEN_WIDTH, SCREEN_HEIGHT), darkness=200)
+
+    start = grid.find_spawn(MADDIE_SIZE, MADDIE_SIZE)
+    goal = grid.find_spawn(MADDIE_SIZE, MADDIE_SIZE, reverse=True)
+    path = maze_path(grid, start, goal, w, h)
+
+    for i in range(frames):
+        profiler.begin_frame()
+        # Spread the whole route over the run, however many frames it has
+        px, py = path[i * (len(path) - 1) // max(frames - 1, 1)]
+        profiler.lap("input")
+        x, y = path[max(0, (i - 1) * (len(path) - 1) // max(frames - 1, 1))]
+        if px != x and grid.is_walkable(px, y, w, h):
+            x = px
+        if py != y and grid.is_walkable(x, py, w, h):
+            y = py
+        profiler.lap("movement")
+
+        cam_x = max(0, min(x - SCREEN_WIDTH // 2, grid.width - SCREEN_WIDTH))
+        cam_y = max(0, min(y - SCREEN_HEIGHT // 2, grid.height - SCREEN_HEIGHT))
+        maze_tiles.draw(screen, cam_x, cam_y)
+        screen.blit(darkened(andreas), (goal[0] - cam_x, goal[1] - cam_y))
+        screen.blit(darkened(maddie), (x - cam_x, y - cam_y))
+        profiler.lap("draw")
+        lighting.draw(screen, ((x - cam_x + w // 2 + 30, y - cam_y + h // 2, 150),))
+        profiler.lap("torch")
+        label = text_cache.render(font, "Time: ", (255, 255, 255))
+        screen.blit(label, (10, 10))
+        text_cache.draw_glyphs(screen, font, f"{i // 3600}:{i // 60 % 60:02d}", (10 + label.get_width(), 10), (255, 255, 255))
+        profiler.lap("hud")
+        pygame.display.flip()
+        profiler.lap("display")
+        profiler.end_frame()
+
+
+# --- Runner ---
+def run(name, frames):
+    profiler = Profiler(window=frames)
+    gc.collect()
+    collections = sum(s["collections"] for s in gc.get_stats())
+    blocks = sys.getallocatedblocks()
+    start = perf_counter()
+    SCENARIOS[name](frames, profiler)
+    elapsed = perf_counter() - start
+    # Setup (asset loading, path finding) is outside the profiled frames
+    frame_time = sum(profiler.samples["frame"]) if profiler.frames else elapsed
+    return {
+        "frames": profiler.frames,
+        "fps": round(profiler.frames / frame_time, 1),
+        "median_fps": round(1000 / profiler.stats()["frame"]["p50"], 1) if profiler.frames else 0.0,
+        "setup_s": round(elapsed - frame_time, 3),
+        "phases": profiler.stats(),
+        "gc_collections": sum(s["collections"] for s in gc.get_stats()) - collections,
+        "allocated_blocks": sys.getallocatedblocks() - blocks,
+    }
+
+def compare(results, baseline, tolerance):
+    """Print median fps against `baseline`; returns the names of scenarios that regressed.
+
+    The median frame is compared rather than the mean, so one stall from
+    the OS does not fail a run.
+    """
+    regressed = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            print(f"{name:<16} {result['median_fps']:>9.1f} fps  (no baseline)", file=sys.stderr)
+            continue
+        ratio = result["median_fps"] / base["median_fps"]
+        flag = "REGRESSION" if ratio < 1 - tolerance else ""
+        print(f"{name:<16} {result['median_fps']:>9.1f} fps  baseline {base['median_fps']:>9.1f}  {ratio - 1:+7.1%}  {flag}", file=sys.stderr)
+        if flag:
+            regressed.append(name)
+    return regressed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the headless game benchmarks.")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--only", nargs="+", choices=sorted(SCENARIOS), help="scenarios to run (default: all)")
+    parser.add_argument("--out", help="write the results JSON here as well as to stdout")
+    parser.add_argument("--save-baseline", metavar="FILE", help="store the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median fps drop before failing (default 0.2)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    results = {
+        "seed": SEED,
+        "frames": args.frames,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "scenarios": {name: run(name, args.frames) for name in args.only or SCENARIOS},
+    }
+    pygame.quit()
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                f.write(output + "\n")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,437 @@
+# Headless simulation core for Special Day Dodger
+#
+# The game rules with no pygame in sight: a seeded RNG, a clock and one
+# button bitmask per fixed-size step go in, plain state and event names
+# come out. The games render from this state; benchmarks and bots can
+# step it as fast as they like without a display.
+
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice, repeat
+from operator import sub
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
+# Speeds and per-step rates below are tuned for steps of 1 / FPS seconds;
+# a sim with another dt scales them so the game plays the same per second
+FPS = 60
+SPEED_INCREMENT = 0.005
+
+# Button bits accepted by DodgerSim.step()
+LEFT, RIGHT, UP, DOWN, FIRE = 1, 2, 4, 8, 16
+
+
+class ObstacleStore:
+    """Pool of obstacles as parallel arrays of x, y, size and sprite id.
+
+    Live obstacles occupy slots [0, count); the slots after them are the
+    free list that spawn() recycles, so after warm-up nothing is allocated
+    per obstacle. x is kept relative to a scroll origin, so moving every
+    obstacle left is a single add in `advance()`. Obstacles spawn at the
+    right edge and all scroll together, which keeps the live slots sorted
+    by x: range queries are two bisections and off-screen entries can only
+    sit at the front.
+    """
+
+    __slots__ = ('kinds', 'ids', 'min_size', 'scroll', 'count', 'x', 'y', 'size', 'kind')
+
+    def __init__(self, sizes, capacity=64):
+        self.kinds = list(sizes)
+        self.ids = {kind: i for i, kind in enumerate(self.kinds)}
+        self.min_size = min(sizes.values())
+        self.x = array('d', repeat(0.0, capacity))
+        self.y = array('d', repeat(0.0, capacity))
+        self.size = array('H', repeat(0, capacity))
+        self.kind = array('B', repeat(0, capacity))
+        self.clear()
+
+    def clear(self):
+        self.scroll = 0.0
+        self.count = 0
+
+    def buffers(self):
+        return self.x, self.y, self.size, self.kind
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yield (x, y, kind, size) in screen coordinates."""
+        n = self.count
+        return zip(map(sub, islice(self.x, n), repeat(self.scroll)), islice(self.y, n),
+                   map(self.kinds.__getitem__, islice(self.kind, n)), islice(self.size, n))
+
+    def spawn(self, x, y, kind, size):
+        i = self.count
+        if i == len(self.x):
+            for buf in self.buffers():
+                buf.extend(buf)
+        self.x[i] = x + self.scroll
+        self.y[i] = y
+        self.size[i] = size
+        self.kind[i] = self.ids[kind]
+        self.count = i + 1
+
+    def advance(self, dx):
+        self.scroll += dx
+
+    def remove_at(self, i):
+        n = self.count
+        for buf in self.buffers():
+            buf[i:n - 1] = buf[i + 1:n]
+        self.count = n - 1
+
+    def x_range(self, lo, hi):
+        """Indices of obstacles whose left edge x satisfies lo < x < hi."""
+        xs, n = self.x, self.count
+        return range(bisect_right(xs, lo + self.scroll, 0, n), bisect_left(xs, hi + self.scroll, 0, n))
+
+    def cull(self, extent=None):
+        """Drop obstacles whose right edge (x + extent, or x + size) is past 0; returns how many."""
+        scroll, xs, sizes, count = self.scroll, self.x, self.size, self.count
+        # Only the front can be off-screen: nothing past x = -min_size yet
+        n = bisect_left(xs, scroll - (extent if extent is not None else self.min_size), 0, count)
+        if not n:
+            return 0
+        kept = 0
+        for i in range(n):
+            if xs[i] + (extent if extent is not None else sizes[i]) - scroll >= 0:
+                if kept != i:
+                    for buf in self.buffers():
+                        buf[kept] = buf[i]
+                kept += 1
+        removed = n - kept
+        if removed:
+            for buf in self.buffers():
+                buf[kept:count - removed] = buf[n:count]
+            self.count = count - removed
+        return removed
+
+
+class Laser:
+    """The single laser shot; reused from shot to shot and false while inactive."""
+
+    __slots__ = ('x', 'y', 'active')
+
+    def __init__(self):
+        self.x = self.y = 0
+        self.active = False
+
+    def __bool__(self):
+        return self.active
+
+    def fire(self, x, y):
+        self.x, self.y = x, y
+        self.active = True
+
+
+class Trail:
+    """Fixed-capacity ring buffer of the last few (x, y) laser positions."""
+
+    __slots__ = ('xs', 'ys', 'start', 'count')
+
+    def __init__(self, capacity=10):
+        self.xs = array('d', repeat(0.0, capacity))
+        self.ys = array('d', repeat(0.0, capacity))
+        self.clear()
+
+    def clear(self):
+        self.start = self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, x, y):
+        capacity = len(self.xs)
+        i = (self.start + self.count) % capacity
+        self.xs[i], self.ys[i] = x, y
+        if self.count < capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % capacity
+
+    def __iter__(self):
+        """Yield (x, y) oldest first."""
+        capacity = len(self.xs)
+        for k in range(self.count):
+            i = (self.start + k) % capacity
+            yield self.xs[i], self.ys[i]
+
+
+class DodgerSim:
+    """Special Day Dodger rules, advanced one fixed `dt` step at a time.
+
+    `clock` is a zero-argument callable returning seconds; by default it is
+    the simulation's own tick count times `dt`, which keeps runs with the
+    same seed and inputs identical. Movement, spawn chances and difficulty
+    ramps are scaled by `dt`, so a sim stepped at 30 or 144 Hz plays the
+    same per second as one at the default 60. Listeners are called as
+    `listener(sim, events)` after every step, with events such as 'fire',
+    'hit', 'special' and 'crash'.
+    """
+
+    PLAYER_SIZE = 100
+    PLAYER_SPEED = 5
+    LASER_SIZE = (5, 5)
+    LASER_SPEED = 7
+    OBJECT_SIZES = {
+        'flowers': 100,
+        'spreadsheet': 50,
+        'invitation': 60,
+        'rings': 40,
+        'tux': 100,
+        'list': 50,
+    }
+    START_SPEED = 2
+    NORMAL_SPAWN_RATE = 0.02
+    BOOST_SPAWN_RATE = 0.06
+    LASER_HIT_SCORES = True
+
+    def __init__(self, seed=None, dt=1 / FPS, clock=None):
+        self.rng = random.Random(seed)
+        self.buttons = 0
+        self.dt = dt
+        # 60 Hz steps per step: exactly 1.0 at the default dt
+        self.scale = dt * FPS
+        self.clock = clock or self.sim_time
+        self.listeners = []
+        self.events = []
+        self.max_size = max(self.OBJECT_SIZES.values())
+        self.obstacles = ObstacleStore(self.OBJECT_SIZES)
+        self.laser = Laser()
+        self.laser_trail = Trail()
+        self.reset()
+
+    def sim_time(self):
+        return self.ticks * self.dt
+
+    def reset(self, seed=None):
+        """Start a new round, reseeding the RNG with `seed` (or one drawn from it).
+
+        A round is reproducible from `self.seed` and the buttons of each step.
+        """
+        self.seed = self.rng.getrandbits(63) if seed is None else seed
+        self.rng.seed(self.seed)
+        self.ticks = 0
+        self.player_x = 10
+        self.player_y = SCREEN_HEIGHT // 2 - self.PLAYER_SIZE // 2
+        self.laser.active = False
+        self.laser_trail.clear()
+        self.obstacles.clear()
+        self.obstacle_speed = self.START_SPEED
+        self.spawn_rate = self.NORMAL_SPAWN_RATE
+        self.tasks_avoided = 0
+        self.boost_end_time = -10
+        self.maddie_display_time = -10
+        self.special_event_timer = self.clock()
+        self.special_event_interval = self.rng.randint(20, 30)
+        self.crashed = False
+
+    def emit(self, event):
+        self.events.append(event)
+
+    # --- Rules ---
+    def handle_input(self, buttons):
+        size, speed = self.PLAYER_SIZE, self.PLAYER_SPEED * self.scale
+        if buttons & LEFT:
+            self.player_x = max(self.player_x - speed, 0)
+        if buttons & RIGHT:
+            self.player_x = min(self.player_x + speed, SCREEN_WIDTH - size)
+        if buttons & UP:
+            self.player_y -= speed
+        if buttons & DOWN:
+            self.player_y += speed
+
+        # Wrap vertically if more than 35% off-screen
+        if self.player_y + size * 0.35 > SCREEN_HEIGHT:
+            self.player_y = -size * 0.35
+        elif self.player_y < -size * 0.35:
+            self.player_y = SCREEN_HEIGHT - size * 0.35
+        if buttons & FIRE and not self.laser:
+            self.fire_laser()
+
+    def fire_laser(self):
+        lw, lh = self.LASER_SIZE
+        self.laser.fire(self.player_x + self.PLAYER_SIZE // 2 - lw // 2,
+                        self.player_y + self.PLAYER_SIZE // 2 - lh // 2)
+        self.laser_trail.clear()
+        self.emit('fire')
+
+    def update_laser(self):
+        laser = self.laser
+        if laser:
+            self.laser_trail.append(laser.x, laser.y)
+            laser.x += self.LASER_SPEED * self.scale
+            if laser.x > SCREEN_WIDTH:
+                laser.active = False
+                self.laser_trail.clear()
+
+    def spawn_obstacle(self):
+        kind = self.rng.choice(self.obstacles.kinds)
+        size = self.OBJECT_SIZES[kind]
+        y = self.rng.randint(0, SCREEN_HEIGHT - size)
+        self.obstacles.spawn(SCREEN_WIDTH, y, kind, size)
+
+    def update_obstacles(self):
+        self.obstacles.advance(self.obstacle_speed * self.scale)
+        self.tasks_avoided += self.obstacles.cull()
+        self.obstacle_speed += SPEED_INCREMENT / FPS * self.scale
+        if self.rng.random() < self.spawn_rate * self.scale:
+            self.spawn_obstacle()
+
+    def check_collisions(self):
+        buffer = 0.2
+        size = self.PLAYER_SIZE
+        obstacles = self.obstacles
+        xs, ys, sizes, scroll = obstacles.x, obstacles.y, obstacles.size, obstacles.scroll
+
+        # Obstacles spawn at the right edge and scroll together, so a sweep
+        # along x only has to look at the few whose x range can overlap
+
+        # The first obstacle the laser overlaps, if any
+        hit = None
+        laser = self.laser
+        if laser:
+            lw, lh = self.LASER_SIZE
+            lx, ly = laser.x, laser.y
+            for i in obstacles.x_range(lx - self.max_size, lx + lw):
+                ox, oy, osize = xs[i] - scroll, ys[i], sizes[i]
+                if lx + lw > ox and lx < ox + osize and ly < oy + osize and ly + lh > oy:
+                    hit = i
+                    break
+
+        # Obstacles ahead of the laser hit in list order still get the player first
+        px, py = self.player_x + size * buffer, self.player_y + size * buffer
+        psize = size * (1 - 2 * buffer)
+        for i in obstacles.x_range(px - self.max_size, px + psize):
+            if hit is not None and i > hit:
+                break
+            ox, oy = xs[i] - scroll + sizes[i] * buffer, ys[i] + sizes[i] * buffer
+            osize = sizes[i] * (1 - 2 * buffer)
+            if (px < ox + osize and px + psize > ox and py < oy + osize and py + psize > oy):
+                return True
+
+        if hit is not None:
+            obstacles.remove_at(hit)
+            laser.active = False
+            self.laser_trail.clear()
+            if self.LASER_HIT_SCORES:
+                self.tasks_avoided += 1
+            self.emit('hit')
+        return False
+
+    def speed_up(self):
+        self.spawn_rate = min(self.spawn_rate + 0.001 * self.scale, 0.12)
+        self.obstacle_speed = min(self.obstacle_speed + 0.01 * self.scale, 4)
+
+    def handle_special_event(self, now):
+        if now - self.special_event_timer > self.special_event_interval:
+            self.maddie_display_time = now
+            self.boost_end_time = now + 10
+            self.spawn_rate = self.BOOST_SPAWN_RATE
+            self.special_event_timer = now
+            self.special_event_interval = self.rng.randint(20, 30)
+            self.emit('special')
+
+    def maddie_visible(self):
+        return self.clock() - self.maddie_display_time < 5
+
+    def positions(self):
+        """What moves between steps: (player x, player y, obstacle scroll, laser x or None).
+
+        A renderer keeps the value from before a step to draw in between.
+        """
+        return self.player_x, self.player_y, self.obstacles.scroll, self.laser.x if self.laser else None
+
+    # --- Stepping ---
+    def step(self, buttons=0):
+        """Advance one `dt` step with the given button bitmask.
+
+        Returns the step's events; the list is reused by the next step.
+        """
+        self.events.clear()
+        if self.crashed:
+            return self.events
+        self.ticks += 1
+        self.buttons = buttons
+        self.handle_input(buttons)
+        self.update_laser()
+        self.update_obstacles()
+
+        now = self.clock()
+        if 15 < now - self.special_event_timer < 45:
+            self.speed_up()
+        self.handle_special_event(now)
+        if now > self.boost_end_time:
+            self.spawn_rate = self.NORMAL_SPAWN_RATE
+
+        if self.check_collisions():
+            self.crashed = True
+            self.emit('crash')
+        for listener in self.listeners:
+            listener(self, self.events)
+        return self.events
+
+    def run(self, steps, inputs=None):
+        """Step up to `steps` times or until a crash; `inputs(sim)` supplies each step's buttons."""
+        for _ in range(steps):
+            self.step(inputs(self) if inputs else 0)
+            if self.crashed:
+                break
+        return self
+
+
+class ClassicDodgerSim(DodgerSim):
+    """main.py's rules: three obstacle types, a tall laser and a smoother ramp."""
+
+    LASER_SIZE = (20, 40)
+    OBJECT_SIZES = {
+        'spreadsheet': 60,
+        'flowers': 100,
+        'invitation': 60,
+    }
+    LASER_HIT_SCORES = False
+
+    def handle_input(self, buttons):
+        speed = self.PLAYER_SPEED * self.scale
+        if buttons & LEFT: self.player_x -= speed
+        if buttons & RIGHT: self.player_x += speed
+        if buttons & UP: self.player_y -= speed
+        if buttons & DOWN: self.player_y += speed
+        if buttons & FIRE and not self.laser:
+            self.fire_laser()
+        self.wrap_player()
+
+    def fire_laser(self):
+        self.laser.fire(self.player_x + self.PLAYER_SIZE // 2 - self.LASER_SIZE[0] // 2, self.player_y)
+        self.emit('fire')
+
+    def wrap_player(self):
+        size = self.PLAYER_SIZE
+        if self.player_y < -size * 0.35:
+            self.player_y = SCREEN_HEIGHT - size * 0.65
+        elif self.player_y + size * 0.65 > SCREEN_HEIGHT:
+            self.player_y = -size * 0.35
+
+        if self.player_x < 0:
+            self.player_x = 0
+        elif self.player_x > SCREEN_WIDTH - size:
+            self.player_x = SCREEN_WIDTH - size
+
+    def spawn_obstacle(self):
+        if self.rng.random() < self.spawn_rate * self.scale:
+            y = self.rng.randint(0, SCREEN_HEIGHT - self.max_size)
+            kind = self.rng.choice(self.obstacles.kinds)
+            self.obstacles.spawn(SCREEN_WIDTH, y, kind, self.OBJECT_SIZES[kind])
+
+    def update_obstacles(self):
+        self.spawn_obstacle()
+        self.obstacles.advance(self.obstacle_speed * self.scale)
+        self.tasks_avoided += self.obstacles.cull(extent=self.max_size)
+        self.obstacle_speed += SPEED_INCREMENT / FPS * self.scale
+
+    def speed_up(self):
+        max_spawn_rate, max_speed = 0.12, 4
+        # Reach the maximums over 30 seconds
+        self.spawn_rate = min(self.spawn_rate + (max_spawn_rate - self.NORMAL_SPAWN_RATE) / (30 * FPS) * self.scale, max_spawn_rate)
+        self.obstacle_speed = min(self.obstacle_speed + (max_speed - self.START_SPEED) / (30 * FPS) * self.scale, max_speed)
@@ -0,0 +1,38 @@
+# Frame clock with pause and time scaling
+
+import pygame
+
+
+class GameClock:
+    """One timestamp and one delta per frame for the whole game.
+
+    tick() wraps pygame.time.Clock.tick: it waits out the frame, then
+    returns the frame's game-time delta in seconds, that is the real delta
+    capped at `max_dt` (so a stall doesn't become one huge step) times
+    `scale`, or 0 while paused. `time` is the total game time so far and
+    `work` the time the last frame spent before calling tick().
+    """
+
+    def __init__(self, max_dt=0.25):
+        self.clock = pygame.time.Clock()
+        self.max_dt = max_dt
+        self.scale = 1.0
+        self.paused = False
+        self.time = 0.0
+        self.dt = self.real_dt = self.work = 0.0
+
+    def tick(self, fps=0):
+        self.real_dt = self.clock.tick(fps) / 1000
+        self.work = self.clock.get_rawtime() / 1000
+        self.dt = 0.0 if self.paused else min(self.real_dt, self.max_dt) * self.scale
+        self.time += self.dt
+        return self.dt
+
+    def pause(self, paused=True):
+        self.paused = paused
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def get_fps(self):
+        return self.clock.get_fps()
@@ -6,10 +6,23 @@ import json
 import os
 import sys
 
+from assets import AssetLoader, bundle, load_image
+from game_clock import GameClock
+from lighting import Lighting
+from maze import MazeTiles, WalkGrid
+from profiler import profiler
+from quality import quality, TIER_NAMES, MEDIUM, LOW
+from scenes import Scene, SceneMachine
+from sounds import SoundBank
+from sprites import darkened
+from text_cache import text_cache
+
 # --- Constants ---
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
 WHITE, BLACK, LILAC = (255, 255, 255), (0, 0, 0), (171, 147, 186)
 TILE_SIZE, ZOOM, PLAYER_SPEED = 10, 3, 10
+# Maddie moves PLAYER_SPEED px per fixed STEP, whatever the frame rate
+STEP, MAX_STEPS_PER_FRAME = 1 / 60, 5
 MADDIE_SIZE = int(TILE_SIZE * 2.6 * ZOOM)
 COUNTDOWN_TIME, HUG_DURATION = 180, 3000
 LEADERBOARD_FILE = "leaderboard_2.json"
@@ -24,7 +37,7 @@ AUDIO_PATH = os.path.join(BASE_PATH, "audio")
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Maddie Paddy")
-clock = pygame.time.Clock()
+clock = GameClock()
 
 # --- Fonts ---
 def get_font(size, title=False):
@@ -42,57 +55,60 @@ title_font = get_font(72, title=True)
 # --- Drawing Utilities ---
 def draw_text(text, x, y, font_obj=font, color=BLACK):
     for i, line in enumerate(text.splitlines()):
-        screen.blit(font_obj.render(line, True, color), (x, y + i * 30))
+        screen.blit(text_cache.render(font_obj, line, color), (x, y + i * 30))
+
+def draw_counter(label, value, x, y, font_obj=font, color=BLACK):
+    label_surf = text_cache.render(font_obj, label, color)
+    screen.blit(label_surf, (x, y))
+    text_cache.draw_glyphs(screen, font_obj, str(value), (x + label_surf.get_width(), y), color)
 
 def draw_wrapped(text, top_y, font_obj, color=WHITE):
     margin = 50
-    words, lines, current = text.split(), [], ""
-    for word in words:
-        test = f"{current} {word}".strip()
-        if font_obj.size(test)[0] <= SCREEN_WIDTH - 2 * margin:
-            current = test
-        else:
-            lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    for i, line in enumerate(lines):
-        surf = font_obj.render(line, True, color)
+    for i, line in enumerate(text_cache.wrap(font_obj, text, SCREEN_WIDTH - 2 * margin)):
+        surf = text_cache.render(font_obj, line, color)
         rect = surf.get_rect(center=(SCREEN_WIDTH // 2, top_y + i * 35))
         screen.blit(surf, rect)
 
-def draw_torch(surface, player_pos, radius=150, offset=(30, 0)):
-    dark_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    dark_overlay.fill((0, 0, 0, 200))
-    torch_center = (player_pos[0] + offset[0], player_pos[1] + offset[1])
-    pygame.draw.circle(dark_overlay, (0, 0, 0, 0), torch_center, radius)
-    surface.blit(dark_overlay, (0, 0))
+def draw_progress(progress, y, color=WHITE):
+    width = 300
+    x = SCREEN_WIDTH // 2 - width // 2
+    pygame.draw.rect(screen, color, (x, y, width, 20), 1)
+    pygame.draw.rect(screen, color, (x + 2, y + 2, int((width - 4) * progress), 16))
+
+lighting = Lighting((SCREEN_WIDTH, SCREEN_HEIGHT), darkness=200)
 
-def darken_surface(surface, factor=0.5):
-    dark = pygame.Surface(surface.get_size()).convert_alpha()
-    dark.fill((0, 0, 0, int((1 - factor) * 255)))
-    copy = surface.copy()
-    copy.blit(dark, (0, 0))
-    return copy
+def draw_torch(surface, player_pos, radius=150, offset=(30, 0), lanterns=()):
+    torch = (player_pos[0] + offset[0], player_pos[1] + offset[1], radius)
+    # Slower machines get solid darkness beyond the torch instead of fog
+    lighting.draw(surface, (torch, *lanterns), solid=quality.tier >= MEDIUM)
 
 # --- Audio ---
 mute = False
 
-def play_lose_sound():
-    if mute:
-        return
+sounds = SoundBank()
+sounds.add("lose", "lose_sound.mp3", volume=0.7)
+
+def play_sound(name):
+    if not mute:
+        sounds.play(name)
+
+def load_music():
     try:
-        sound = pygame.mixer.Sound(os.path.join(AUDIO_PATH, "lose_sound.mp3"))
-        sound.set_volume(0.7)
-        sound.play()
-    except Exception as e:
-        print(f"Lose sound error: {e}")
+        pygame.mixer.music.load(os.path.join(AUDIO_PATH, "sadmaze.mp3"))
+        return True
+    except:
+        return False
 
-try:
-    pygame.mixer.init()
-    pygame.mixer.music.load(os.path.join(AUDIO_PATH, "sadmaze.mp3"))
+def start_music(loaded):
+    global mute
+    if not loaded:
+        mute = True
+        return
     pygame.mixer.music.set_volume(0.2)
     pygame.mixer.music.play(-1)
+
+try:
+    pygame.mixer.init()
 except:
     mute = True
 
@@ -110,203 +126,299 @@ def save_leaderboard(data):
 leaderboard = load_leaderboard()
 
 # --- Load Assets ---
+# Only the fonts above are needed for the start screen; everything else
+# loads in the background while it is showing.
 def load_scaled_image(name, height):
-    raw = pygame.image.load(os.path.join(IMAGE_PATH, name)).convert_alpha()
-    factor = height / raw.get_height()
-    return pygame.transform.scale(raw, (int(raw.get_width() * factor), height))
-
-maze_img_raw = pygame.image.load(os.path.join(IMAGE_PATH, "mazebgclippedpurpscare2.png")).convert()
-maze_img = pygame.transform.scale(maze_img_raw, (maze_img_raw.get_width() * ZOOM, maze_img_raw.get_height() * ZOOM))
-maze_rect = maze_img.get_rect()
-
-maddie_img = load_scaled_image("maddiesadre.png", 80)
-andreas_img = load_scaled_image("andreasrev.png", 80)
-hug_img = pygame.transform.scale(pygame.image.load(os.path.join(IMAGE_PATH, "andymaddie_hug.png")).convert_alpha(), (300, 300))
-MADDIE_WIDTH, MADDIE_HEIGHT = maddie_img.get_size()
-andreas_width, andreas_height = andreas_img.get_size()
+    return load_image(name, (None, height))
+
+def load_maze():
+    raw = pygame.image.load(os.path.join(IMAGE_PATH, "mazebgclippedpurpscare2.png"))
+    grid = WalkGrid(raw, ZOOM)
+    grid.find_spawn(MADDIE_SIZE, MADDIE_SIZE)
+    grid.find_spawn(MADDIE_SIZE, MADDIE_SIZE, reverse=True)
+    return grid, raw
+
+def finish_maze(loaded):
+    global maze_grid, maze_tiles, maze_rect, player_x, player_y, andreas_x, andreas_y
+    maze_grid, raw = loaded
+    # Zoomed a tile at a time as the camera reaches it, never as a whole
+    maze_tiles = MazeTiles(raw.convert(), ZOOM)
+    maze_rect = maze_tiles.get_rect()
+    player_x, player_y = find_position(MADDIE_SIZE)
+    andreas_x, andreas_y = find_position(MADDIE_SIZE, reverse=True)
+
+def finish_sprites(_):
+    global maddie_img, andreas_img, hug_img, MADDIE_WIDTH, MADDIE_HEIGHT, andreas_width, andreas_height
+    maddie_img = load_scaled_image("maddiesadre.png", 80)
+    andreas_img = load_scaled_image("andreasrev.png", 80)
+    hug_img = load_image("Andymaddie_hug.png", (300, 300))
+    MADDIE_WIDTH, MADDIE_HEIGHT = maddie_img.get_size()
+    andreas_width, andreas_height = andreas_img.get_size()
+
+loader = AssetLoader()
+loader.add(bundle.preload, finish_sprites)
+loader.add(load_maze, finish_maze)
+loader.add(load_music, start_music)
+loader.add(sounds.load)
 
 # --- Position Functions ---
 def is_walkable(x, y, w, h):
-    for i in range(w):
-        for j in range(h):
-            if not (0 <= x + i < maze_rect.width and 0 <= y + j < maze_rect.height):
-                return False
-            if maze_img.get_at((x + i, y + j)) != pygame.Color(BLACK):
-                return False
-    return True
+    return maze_grid.is_walkable(x, y, w, h)
 
 def find_position(size, reverse=False):
-    x_range = range(maze_rect.width - size, 0, -1) if reverse else range(0, maze_rect.width - size)
-    y_range = range(maze_rect.height - size, 0, -1) if reverse else range(0, maze_rect.height - size)
-    for y in y_range:
-        for x in x_range:
-            if is_walkable(x, y, size, size):
-                return x, y
-    return TILE_SIZE, TILE_SIZE
+    return maze_grid.find_spawn(size, size, reverse) or (TILE_SIZE, TILE_SIZE)
 
 # --- Game State ---
-running, show_start, win, hugging = True, True, False, False
-timer, hugging_start = COUNTDOWN_TIME, 0
-pygame.time.set_timer(pygame.USEREVENT, 1000)
-
-player_x, player_y = find_position(MADDIE_SIZE)
-andreas_x, andreas_y = find_position(MADDIE_SIZE, reverse=True)
-
-# --- Main Loop ---
-while running:
-    dt = clock.tick(60)
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
+running, timer, remaining_time = True, COUNTDOWN_TIME, 0
+lag, second = 0.0, 0.0
+prev_x = prev_y = None
+
+def new_round():
+    global timer, second, player_x, player_y, andreas_x, andreas_y
+    timer, second = COUNTDOWN_TIME, 0.0
+    player_x, player_y = find_position(MADDIE_SIZE)
+    andreas_x, andreas_y = find_position(MADDIE_SIZE, reverse=True)
+
+def toggle_mute():
+    global mute
+    mute = not mute
+    pygame.mixer.music.pause() if mute else pygame.mixer.music.unpause()
+
+def note_quality(tier):
+    profiler.note("quality", TIER_NAMES[tier])
+
+note_quality(quality.tier)
+quality.listeners.append(note_quality)
+
+def maddie_position():
+    """Where to draw Maddie: between her last two steps at the LOW tier, which renders at half rate."""
+    if quality.tier < LOW or prev_x is None:
+        return player_x, player_y
+    back = 1 - lag / STEP
+    return player_x - (player_x - prev_x) * back, player_y - (player_y - prev_y) * back
+
+def draw_timer():
+    draw_counter("Time: ", f"{timer // 60}:{timer % 60:02d}", 10, 10, big_font, WHITE)
+
+# --- Scenes ---
+class Start(Scene):
+    static = True
+
+    def update(self, dt):
+        if not loader.done():
+            loader.poll()
+            scenes.redraw()
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_m:
-                mute = not mute
-                pygame.mixer.music.pause() if mute else pygame.mixer.music.unpause()
-            elif event.key == pygame.K_RETURN and show_start:
-                show_start = False
-        elif event.type == pygame.USEREVENT and not win and not hugging:
-            timer -= 1
+                toggle_mute()
+            elif event.key == pygame.K_RETURN and loader.done():
+                scenes.switch(playing)
 
-    if show_start:
+    def draw(self):
         screen.fill(BLACK)
         draw_wrapped("Maddie Paddy", 200, title_font)
         draw_wrapped("Help Maddie find Andreas for hugs and avoid an anxiety attack.", 280, font)
-        draw_wrapped("Arrow keys to move. M to mute.", 340, font)
-        draw_wrapped("Press Enter to start", 420, font)
+        draw_wrapped("Arrow keys to move. P to pause. M to mute.", 340, font)
+        if loader.done():
+            draw_wrapped("Press Enter to start", 420, font)
+        else:
+            draw_progress(loader.progress(), 420)
         pygame.display.update()
-        continue
-
-    if hugging:
-        elapsed = pygame.time.get_ticks() - hugging_start
-        if elapsed >= HUG_DURATION:
-            hugging, win = False, True
-            remaining_time = timer
-            continue
+
+class Playing(Scene):
+    @property
+    def fps(self):
+        return quality.frame_rate(60)
+
+    def enter(self):
+        global lag, prev_x, prev_y
+        lag, prev_x, prev_y = 0.0, None, None
+        quality.reset()
+
+    def exit(self):
+        clock.pause(False)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            toggle_mute()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            clock.toggle_pause()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle()
+
+    def update(self, dt):
+        global player_x, player_y, timer, lag, second, prev_x, prev_y
+        if not clock.paused:
+            quality.update(clock.work, clock.real_dt, self.fps)
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        profiler.lap("input")
+
+        # The countdown runs on game time, so it stops while paused
+        second += dt
+        while second >= 1:
+            timer -= 1
+            second -= 1
+
+        lag = min(lag + dt, MAX_STEPS_PER_FRAME * STEP)
+        while lag >= STEP:
+            prev_x, prev_y = player_x, player_y
+            if dx and is_walkable(player_x + dx * PLAYER_SPEED, player_y, MADDIE_WIDTH, MADDIE_HEIGHT):
+                player_x += dx * PLAYER_SPEED
+            if dy and is_walkable(player_x, player_y + dy * PLAYER_SPEED, MADDIE_WIDTH, MADDIE_HEIGHT):
+                player_y += dy * PLAYER_SPEED
+            lag -= STEP
+        profiler.lap("movement")
+
+    def draw(self):
+        # Camera
+        x, y = maddie_position()
+        cam_x = max(0, min(x - SCREEN_WIDTH // 2, maze_rect.width - SCREEN_WIDTH))
+        cam_y = max(0, min(y - SCREEN_HEIGHT // 2, maze_rect.height - SCREEN_HEIGHT))
+
+        maze_tiles.draw(screen, cam_x, cam_y)
+        screen.blit(darkened(andreas_img), (andreas_x - cam_x, andreas_y - cam_y))
+        screen.blit(darkened(maddie_img), (x - cam_x, y - cam_y))
+        profiler.lap("draw")
+        draw_torch(screen, (x - cam_x + MADDIE_WIDTH // 2, y - cam_y + MADDIE_HEIGHT // 2))
+        profiler.lap("torch")
+        draw_timer()
+        if clock.paused:
+            draw_wrapped("PAUSED", SCREEN_HEIGHT // 2 - 20, big_font)
+        if profiler.visible:
+            profiler.draw(screen, font)
+        profiler.lap("hud")
+        pygame.display.flip()
+        profiler.lap("display")
+
+        if andreas_x <= player_x + MADDIE_WIDTH // 2 <= andreas_x + andreas_width and andreas_y <= player_y + MADDIE_HEIGHT // 2 <= andreas_y + andreas_height:
+            scenes.switch(hug)
+        elif timer <= 0:
+            scenes.switch(game_over)
+
+class Hug(Scene):
+    duration = HUG_DURATION / 1000
+
+    def enter(self):
+        pygame.mixer.music.stop()
+
+    def draw(self):
         screen.fill(BLACK)
-        if elapsed < 1000:
+        if scenes.elapsed < 1:
             screen.blit(maddie_img, (SCREEN_WIDTH // 2 - MADDIE_WIDTH + 10, SCREEN_HEIGHT // 2 - MADDIE_HEIGHT // 2))
             screen.blit(andreas_img, (SCREEN_WIDTH // 2 - 10, SCREEN_HEIGHT // 2 - andreas_height // 2))
         else:
             screen.blit(hug_img, (SCREEN_WIDTH // 2 - hug_img.get_width() // 2, SCREEN_HEIGHT // 2 - hug_img.get_height() // 2))
-        screen.blit(big_font.render(f"Time: {timer // 60}:{timer % 60:02d}", True, WHITE), (10, 10))
+        draw_timer()
         pygame.display.flip()
-        continue
-
-    # Movement
-    keys = pygame.key.get_pressed()
-    dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
-    dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
-    if dx and is_walkable(player_x + dx * PLAYER_SPEED, player_y, MADDIE_WIDTH, MADDIE_HEIGHT):
-        player_x += dx * PLAYER_SPEED
-    if dy and is_walkable(player_x, player_y + dy * PLAYER_SPEED, MADDIE_WIDTH, MADDIE_HEIGHT):
-        player_y += dy * PLAYER_SPEED
-
-    # Camera
-    cam_x = max(0, min(player_x - SCREEN_WIDTH // 2, maze_rect.width - SCREEN_WIDTH))
-    cam_y = max(0, min(player_y - SCREEN_HEIGHT // 2, maze_rect.height - SCREEN_HEIGHT))
-
-    screen.blit(maze_img, (-cam_x, -cam_y))
-    screen.blit(darken_surface(andreas_img), (andreas_x - cam_x, andreas_y - cam_y))
-    screen.blit(darken_surface(maddie_img), (player_x - cam_x, player_y - cam_y))
-    draw_torch(screen, (player_x - cam_x + MADDIE_WIDTH // 2, player_y - cam_y + MADDIE_HEIGHT // 2))
-    screen.blit(big_font.render(f"Time: {timer // 60}:{timer % 60:02d}", True, WHITE), (10, 10))
-    pygame.display.flip()
-
-    if not win and not hugging and andreas_x <= player_x + MADDIE_WIDTH // 2 <= andreas_x + andreas_width and andreas_y <= player_y + MADDIE_HEIGHT // 2 <= andreas_y + andreas_height:
-        hugging = True
-        hugging_start = pygame.time.get_ticks()
-        pygame.mixer.music.stop()
 
-    if win:
-        pygame.mixer.music.stop()
+    def timeout(self):
+        global remaining_time
+        remaining_time = timer
+        scenes.switch(win)
+
+class Win(Scene):
+    static = True
+    duration = 2
+
+    def draw(self):
         screen.fill(BLACK)
         draw_wrapped("You found Andreas! Hugs ahoy!", SCREEN_HEIGHT // 2 - 80, big_font)
         draw_wrapped(f"Time left: {remaining_time // 60}:{remaining_time % 60:02d}", SCREEN_HEIGHT // 2 - 40, font)
         pygame.display.update()
-        pygame.time.delay(2000)
-
-        def get_initials():
-            name = ""
-            while len(name) < 3:
-                screen.fill(BLACK)
-                draw_wrapped("Enter Your Initials:", SCREEN_HEIGHT // 2 - 60, font)
-                draw_wrapped(name, SCREEN_HEIGHT // 2, initial_font)
-                pygame.display.update()
-                for e in pygame.event.get():
-                    if e.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    elif e.type == pygame.KEYDOWN:
-                        if e.unicode.upper() in string.ascii_uppercase:
-                            name += e.unicode.upper()
-                        elif e.key == pygame.K_BACKSPACE:
-                            name = name[:-1]
-            return name
-
-        initials = get_initials()
-        leaderboard.append((initials, remaining_time))
-        leaderboard.sort(key=lambda x: x[1], reverse=True)
-        leaderboard = leaderboard[:5]
-        save_leaderboard(leaderboard)
 
+    def timeout(self):
+        scenes.switch(initials)
+
+class Initials(Scene):
+    static = True
+
+    def enter(self):
+        self.name = ""
+
+    def handle(self, event):
+        global leaderboard
+        if event.type == pygame.KEYDOWN:
+            if event.unicode.upper() in string.ascii_uppercase:
+                self.name += event.unicode.upper()
+            elif event.key == pygame.K_BACKSPACE:
+                self.name = self.name[:-1]
+            scenes.redraw()
+        if len(self.name) == 3:
+            leaderboard.append((self.name, remaining_time))
+            leaderboard.sort(key=lambda x: x[1], reverse=True)
+            leaderboard = leaderboard[:5]
+            save_leaderboard(leaderboard)
+            scenes.switch(win_board)
+
+    def draw(self):
         screen.fill(BLACK)
-        draw_text("LEADERBOARD - LEAST PANICKY PERCY", 100, 100, font, WHITE)
-        for i, (name, score) in enumerate(leaderboard):
-            draw_text(f"{i + 1}. {name} - {score // 60}:{score % 60:02d}", 120, 150 + i * 50, initial_font, WHITE)
-        draw_text("Press Enter to Restart. ESC for Menu.", 120, 450, font, WHITE)
+        draw_wrapped("Enter Your Initials:", SCREEN_HEIGHT // 2 - 60, font)
+        draw_wrapped(self.name, SCREEN_HEIGHT // 2, initial_font)
         pygame.display.update()
 
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_RETURN:
-                        win = False
-                        timer = COUNTDOWN_TIME
-                        player_x, player_y = find_position(MADDIE_SIZE)
-                        andreas_x, andreas_y = find_position(MADDIE_SIZE, reverse=True)
-                        pygame.mixer.music.play(-1)
-                        waiting = False
-                    elif e.key == pygame.K_ESCAPE:
-                        show_start = True
-                        win = False
-                        waiting = False
-
-    elif timer <= 0 and not win:
+class GameOver(Scene):
+    static = True
+    duration = 3
+
+    def enter(self):
         pygame.mixer.music.stop()
-        play_lose_sound()
+        play_sound("lose")
+
+    def draw(self):
         screen.fill(BLACK)
         draw_wrapped("Oops. Full blown anxiety attack. Too late!", SCREEN_HEIGHT // 2 - 40, font)
         pygame.display.update()
-        pygame.time.delay(3000)
 
+    def timeout(self):
+        scenes.switch(lose_board)
+
+class Leaderboard(Scene):
+    static = True
+
+    def __init__(self, title, format_score):
+        self.title = title
+        self.format_score = format_score
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                new_round()
+                pygame.mixer.music.play(-1)
+                scenes.switch(playing)
+            elif event.key == pygame.K_ESCAPE:
+                new_round()
+                scenes.switch(start)
+
+    def draw(self):
         screen.fill(BLACK)
-        draw_text("LEADERBOARD - TIME LEFT", 100, 100, font, WHITE)
+        draw_text(self.title, 100, 100, font, WHITE)
         for i, (name, score) in enumerate(leaderboard):
-            draw_text(f"{i + 1}. {name} - {score}", 120, 150 + i * 50, initial_font, WHITE)
+            draw_text(f"{i + 1}. {name} - {self.format_score(score)}", 120, 150 + i * 50, initial_font, WHITE)
         draw_text("Press Enter to Restart. ESC for Menu.", 120, 450, font, WHITE)
         pygame.display.update()
 
-        waiting = True
-        while waiting:
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif e.type == pygame.KEYDOWN:
-                    if e.key == pygame.K_RETURN:
-                        timer = COUNTDOWN_TIME
-                        player_x, player_y = find_position(MADDIE_SIZE)
-                        andreas_x, andreas_y = find_position(MADDIE_SIZE, reverse=True)
-                        pygame.mixer.music.play(-1)
-                        waiting = False
-                    elif e.key == pygame.K_ESCAPE:
-                        show_start = True
-                        waiting = False
+start, playing, hug, win = Start(), Playing(), Hug(), Win()
+initials, game_over = Initials(), GameOver()
+win_board = Leaderboard("LEADERBOARD - LEAST PANICKY PERCY", lambda score: f"{score // 60}:{score % 60:02d}")
+lose_board = Leaderboard("LEADERBOARD - TIME LEFT", str)
+
+# --- Main Loop ---
+scenes = SceneMachine(start)
+frame_time = 0.0
+while running:
+    profiler.begin_frame()
+    events = pygame.event.get()
+    for event in events:
+        if event.type == pygame.QUIT:
+            running = False
+    scenes.frame(events, frame_time)
+    profiler.end_frame()
+    frame_time = clock.tick(scenes.fps)
 
+profiler.save()
 pygame.quit()
 sys.exit()
@@ -1,6 +1,4 @@
 import pygame
-import random
-import time
 import string
 import json
 import os
@@ -8,31 +6,49 @@ import asyncio
 import platform
 import sys
 
+from assets import AssetLoader, bundle, load_image
+from dodger_sim import ClassicDodgerSim, FPS, LEFT, RIGHT, UP, DOWN, FIRE
+from game_clock import GameClock
+from profiler import profiler
+from quality import quality, TIER_NAMES, LOW
+from render import DirtyRenderer
+from replay import Recorder
+from scenes import Scene, SceneMachine
+from sounds import SoundBank
+from text_cache import text_cache
+
 # Initialize Pygame and audio
 pygame.init()
 pygame.mixer.init()
 
 # Constants
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-PLAYER_SIZE = 100
-FLOWER_SIZE = 100
-SPREADSHEET_SIZE = 60
-INVITATION_SIZE = 60
-LASER_SIZE = (20, 40)
-SPEED_INCREMENT = 0.005
-FPS = 60
+PLAYER_SIZE = ClassicDodgerSim.PLAYER_SIZE
+FLOWER_SIZE = ClassicDodgerSim.OBJECT_SIZES['flowers']
+SPREADSHEET_SIZE = ClassicDodgerSim.OBJECT_SIZES['spreadsheet']
+INVITATION_SIZE = ClassicDodgerSim.OBJECT_SIZES['invitation']
+LASER_SIZE = ClassicDodgerSim.LASER_SIZE
+MAX_STEPS_PER_FRAME = 5
 WHITE, BLACK = (255, 255, 255), (0, 0, 0)
 LEADERBOARD_FILE = "leaderboard.json"
+REPLAY_FILE = "last_run.replay"
+
+# Initialize game screen
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+pygame.display.set_caption("Special Day Dodger")
+clock = GameClock()
 
-# Load and scale images
-def load_image(path, size):
-    return pygame.transform.scale(pygame.image.load(path), size)
+# Load and scale images (from the baked sprite bundle when available)
+andreas_img = maddie_img = None
+obstacle_images = {}
 
-andreas_img = load_image("images/andreas.png", (PLAYER_SIZE, PLAYER_SIZE))
-spreadsheet_img = load_image("images/spreadsheet.png", (SPREADSHEET_SIZE, SPREADSHEET_SIZE))
-flowers_img = load_image("images/flowers.png", (FLOWER_SIZE, FLOWER_SIZE))
-invitation_img = load_image("images/invitation.png", (INVITATION_SIZE, INVITATION_SIZE))
-maddie_img = load_image("images/maddievillain.png", (200, 200))
+def finish_images(_):
+    global andreas_img, maddie_img
+    andreas_img = load_image("andreas.png", (PLAYER_SIZE, PLAYER_SIZE))
+    obstacle_images['spreadsheet'] = load_image("spreadsheet.png", (SPREADSHEET_SIZE, SPREADSHEET_SIZE))
+    obstacle_images['flowers'] = load_image("flowers.png", (FLOWER_SIZE, FLOWER_SIZE))
+    obstacle_images['invitation'] = load_image("invitation.png", (INVITATION_SIZE, INVITATION_SIZE))
+    maddie_img = load_image("maddievillain.png", (200, 200))
 
 # Font setup
 def get_font(size):
@@ -43,46 +59,58 @@ def get_font(size):
 
 font = get_font(24)
 small_font = get_font(20)
-
-# Initialize game screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Special Day Dodger")
-clock = pygame.time.Clock()
+title_font = get_font(42)
+subtitle_font = get_font(28)
+body_font = get_font(22)
+prompt_font = get_font(26)
 
 # Check if running in browser
 IS_WEB = sys.platform == "emscripten"
 
 # Audio - Try OGG first (for web), then MP3, then disable audio
 audio_enabled = False
-try:
+
+def load_music():
     try:
         pygame.mixer.music.load("audio/whistle_tune.ogg")
-        audio_enabled = True
     except:
         pygame.mixer.music.load("audio/whistle_tune.ogg")
-        audio_enabled = True
+
+def start_music(_):
+    global audio_enabled
+    audio_enabled = True
     pygame.mixer.music.play(-1)
-except Exception as e:
-    print(f"Could not load background music: {e}")
+    if mute:
+        pygame.mixer.music.pause()
+
+# Only the fonts are needed for the start screen; sprites and music load
+# in the background (or a job per frame in the browser) while it shows.
+loader = AssetLoader()
+loader.add(bundle.preload, finish_images)
+loader.add(load_music, start_music)
+
+# Sound effects, decoded once when loading rather than on every event
+sounds = SoundBank()
+sounds.add("special", ("special_day.ogg", "special_day.ogg"))
+loader.add(sounds.load)
+
+def play_special_sound(sim, events):
+    if 'special' in events and not mute and audio_enabled:
+        sounds.play("special")
 
 # Game state variables
-player_x, player_y = 10, SCREEN_HEIGHT // 2 - PLAYER_SIZE // 2
-player_speed = 5
-laser = None
-laser_speed = 7
-obstacles = []
-obstacle_speed = 2
-spawn_rate = 0.02
-normal_spawn_rate = spawn_rate
-speed_multiplier = 1.25
-tasks_avoided = 0
-special_event_timer = time.time()
-special_event_interval = random.randint(20, 30)
-maddie_display_time = -10
-boost_end_time = -10
+sim = ClassicDodgerSim()
+renderer = DirtyRenderer(screen, WHITE)
+sim.listeners.append(play_special_sound)
+# Every round is recorded so a reported crash or score can be replayed
+recorder = Recorder("classic")
+sim.listeners.append(recorder)
+for method in ("update_laser", "spawn_obstacle", "update_obstacles", "check_collisions"):
+    profiler.wrap(sim, method)
+lag, frame_time = 0.0, 0.0
+previous = None
 mute = False
 running = True
-show_start_screen = True
 
 # Load leaderboard from file or localStorage
 leaderboard = []
@@ -111,283 +139,265 @@ def save_leaderboard():
             json.dump(leaderboard, f)
 
 def draw_text(text, x, y, font_obj=font, color=BLACK):
+    rect = pygame.Rect(x, y, 0, 0)
     for i, line in enumerate(text.splitlines()):
-        text_obj = font_obj.render(line, True, color)
-        screen.blit(text_obj, (x, y + i * 30))
-
-def handle_input():
-    global player_x, player_y, laser
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT] or keys[pygame.K_a]: player_x -= player_speed
-    if keys[pygame.K_RIGHT] or keys[pygame.K_d]: player_x += player_speed
-    if keys[pygame.K_UP] or keys[pygame.K_w]: player_y -= player_speed
-    if keys[pygame.K_DOWN] or keys[pygame.K_s]: player_y += player_speed
-    if keys[pygame.K_SPACE] and not laser:
-        laser = [player_x + PLAYER_SIZE // 2 - LASER_SIZE[0] // 2, player_y]
-
-def update_laser():
-    global laser
-    if laser:
-        laser[0] += laser_speed
-        if laser[0] > SCREEN_WIDTH:
-            laser = None
-
-def update_obstacles():
-    global obstacles, obstacle_speed, tasks_avoided
-    for obstacle in obstacles[:]:
-        obstacle[0] -= obstacle_speed
-        if obstacle[0] < -FLOWER_SIZE:
-            obstacles.remove(obstacle)
-            tasks_avoided += 1
-    obstacle_speed += SPEED_INCREMENT / FPS
-
-def spawn_obstacle():
-    if random.random() < spawn_rate:
-        y = random.randint(0, SCREEN_HEIGHT - FLOWER_SIZE)
-        image = random.choice([
-            [spreadsheet_img, SPREADSHEET_SIZE],
-            [flowers_img, FLOWER_SIZE],
-            [invitation_img, INVITATION_SIZE]
-        ])
-        obstacles.append([SCREEN_WIDTH, y, image[0], image[1]])
-
-def check_collisions():
-    global laser
-    buffer = 0.2
-    px, py = player_x + PLAYER_SIZE * buffer, player_y + PLAYER_SIZE * buffer
-    psize = PLAYER_SIZE * (1 - 2 * buffer)
-    for obstacle in obstacles[:]:
-        ox, oy = obstacle[0] + obstacle[3] * buffer, obstacle[1] + obstacle[3] * buffer
-        osize = obstacle[3] * (1 - 2 * buffer)
-        if (px < ox + osize and px + psize > ox and py < oy + osize and py + psize > oy):
-            return True
-        if laser and (laser[0] + LASER_SIZE[0] > obstacle[0] and laser[0] < obstacle[0] + obstacle[3] and
-                      laser[1] < obstacle[1] + obstacle[3] and laser[1] + LASER_SIZE[1] > obstacle[1]):
-            obstacles.remove(obstacle)
-            laser = None
-            break
-    return False
-
-def show_leaderboard():
-    screen.fill(BLACK)
-    draw_text("LEADERBOARD - TASKS AVOIDED", 100, 100, font, WHITE)
-    for i, entry in enumerate(leaderboard):
-        name, score = entry
-        draw_text(f"{i+1}. {name} - {score}", 120, 150 + i * 40, font, WHITE)
-    draw_text("Press Enter to Restart", 120, 400, font, WHITE)
-    pygame.display.update()
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                waiting = False
-
-def get_player_initials():
-    name = ""
-    while len(name) < 3:
-        screen.fill(WHITE)
-        draw_text("Enter Your Initials:", 120, SCREEN_HEIGHT // 2 - 40)
-        draw_text(name, 120, SCREEN_HEIGHT // 2)
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.unicode.upper() in string.ascii_uppercase and len(name) < 3:
-                    name += event.unicode.upper()
-                elif event.key == pygame.K_BACKSPACE:
-                    name = name[:-1]
-    return name
-
-def reset_game():
-    global player_x, player_y, laser, obstacles, obstacle_speed, spawn_rate
-    global boost_end_time, tasks_avoided, special_event_timer
-
-    pygame.mixer.music.stop()
-    screen.fill(WHITE)
-    draw_text("Oops. Responsibility caught up with Andreas.", 100, SCREEN_HEIGHT // 2 - 40)
-    pygame.display.update()
-    pygame.time.delay(3000)
-
-    qualifies = len(leaderboard) < 5 or tasks_avoided > leaderboard[-1][1]
-    if qualifies:
-        name = get_player_initials()
-        leaderboard.append((name, tasks_avoided))
-        leaderboard.sort(key=lambda x: x[1], reverse=True)
-        leaderboard[:] = leaderboard[:5]
-        save_leaderboard()
-
-    show_leaderboard()
-
-    player_x = 10
-    player_y = SCREEN_HEIGHT // 2 - PLAYER_SIZE // 2
-    laser = None
-    obstacles.clear()
-    obstacle_speed = 2
-    spawn_rate = normal_spawn_rate
-    boost_end_time = -10
-    tasks_avoided = 0
-    special_event_timer = time.time()
-
-    if not mute:
-        pygame.mixer.music.play(-1)
-
-    pygame.time.delay(1000)
-
-def handle_special_event():
-    global maddie_display_time, boost_end_time, spawn_rate
-    if time.time() - special_event_timer > special_event_interval:
-        maddie_display_time = time.time()
-        boost_end_time = maddie_display_time + 10
-        spawn_rate = min(normal_spawn_rate * 3, 0.1)
-        if not mute and audio_enabled:
-            try:
-                # Try OGG first for web compatibility
-                try:
-                    special_sound = pygame.mixer.Sound("audio/special_day.ogg")
-                except:
-                    special_sound = pygame.mixer.Sound("audio/special_day.ogg")
-                special_sound.play()
-            except Exception as e:
-                print("Could not play special_day sound:", e)
-        return True
-    return False
-
-def speed_up():
-    global spawn_rate, obstacle_speed
-    max_spawn_rate, max_speed = 0.12, 4
-    spawn_rate = min(spawn_rate + (max_spawn_rate - normal_spawn_rate) / (30 * FPS), max_spawn_rate)
-    obstacle_speed = min(obstacle_speed + (max_speed - 2) / (30 * FPS), max_speed)
-
-def wrap_player():
-    global player_x, player_y
-    if player_y < -PLAYER_SIZE * 0.35:
-        player_y = SCREEN_HEIGHT - PLAYER_SIZE * 0.65
-    elif player_y + PLAYER_SIZE * 0.65 > SCREEN_HEIGHT:
-        player_y = -PLAYER_SIZE * 0.35
-
-    if player_x < 0:
-        player_x = 0
-    elif player_x > SCREEN_WIDTH - PLAYER_SIZE:
-        player_x = SCREEN_WIDTH - PLAYER_SIZE
+        text_obj = text_cache.render(font_obj, line, color)
+        rect.union_ip(screen.blit(text_obj, (x, y + i * 30)))
+    return rect
+
+def draw_counter(label, value, x, y, font_obj=font, color=BLACK):
+    label_obj = text_cache.render(font_obj, label, color)
+    screen.blit(label_obj, (x, y))
+    end = text_cache.draw_glyphs(screen, font_obj, str(value), (x + label_obj.get_width(), y), color)
+    return pygame.Rect(x, y, end - x, font_obj.get_height())
+
+def read_buttons(keys):
+    buttons = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]: buttons |= LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]: buttons |= RIGHT
+    if keys[pygame.K_UP] or keys[pygame.K_w]: buttons |= UP
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]: buttons |= DOWN
+    if keys[pygame.K_SPACE]: buttons |= FIRE
+    return buttons
+
+def toggle_mute():
+    global mute
+    mute = not mute
+    if mute:
+        pygame.mixer.music.pause()
+    else:
+        pygame.mixer.music.unpause()
+        if not pygame.mixer.music.get_busy():
+            pygame.mixer.music.play(-1)
 
 def show_start():
     screen.fill(WHITE)
     margin = 50
-    title_font = get_font(42)
-    subtitle_font = get_font(28)
-    body_font = get_font(22)
-    prompt_font = get_font(26)
-
-    def wrap_text(text, font_obj, max_width):
-        words = text.split(' ')
-        lines = []
-        current_line = ''
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            if font_obj.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                lines.append(current_line)
-                current_line = word
-        if current_line:
-            lines.append(current_line)
-        return lines
 
     def draw_wrapped_block(text, top_y, font_obj):
         wrapped_lines = []
         for line in text.splitlines():
-            wrapped_lines.extend(wrap_text(line, font_obj, SCREEN_WIDTH - 2 * margin))
+            wrapped_lines.extend(text_cache.wrap(font_obj, line, SCREEN_WIDTH - 2 * margin))
 
         for i, line in enumerate(wrapped_lines):
-            surface = font_obj.render(line, True, BLACK)
+            surface = text_cache.render(font_obj, line, BLACK)
             rect = surface.get_rect(center=(SCREEN_WIDTH // 2, top_y + i * 35))
             screen.blit(surface, rect)
 
     draw_wrapped_block("Special Day Dodger", margin, title_font)
     draw_wrapped_block("Help Andreas dodge the wedding responsibilities by avoiding or lasering them.", margin + 80, subtitle_font)
-    draw_wrapped_block("Arrows to move.\nSpace bar to shoot.\nM to mute music.", margin + 200, body_font)
-    draw_wrapped_block("Press Enter to Start.", margin + 340, prompt_font)
+    draw_wrapped_block("Arrows to move.\nSpace bar to shoot.\nP to pause.\nM to mute music.", margin + 200, body_font)
+    if loader.done():
+        draw_wrapped_block("Press Enter to Start.", margin + 340, prompt_font)
+    else:
+        width = 300
+        x = SCREEN_WIDTH // 2 - width // 2
+        pygame.draw.rect(screen, BLACK, (x, margin + 330, width, 20), 1)
+        pygame.draw.rect(screen, BLACK, (x + 2, margin + 332, int((width - 4) * loader.progress()), 16))
 
     pygame.display.update()
 
-# Main loop
-async def main():
-    global running, show_start_screen, player_x, player_y, laser, obstacles, obstacle_speed
-    global spawn_rate, boost_end_time, tasks_avoided, special_event_timer, maddie_display_time, mute
-
-    while running:
-        if show_start_screen:
-            show_start()
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        show_start_screen = False
-                    elif event.key == pygame.K_m:
-                        mute = not mute
-                        if mute:
-                            pygame.mixer.music.pause()
-                        else:
-                            pygame.mixer.music.unpause()
-                            if not pygame.mixer.music.get_busy():
-                                pygame.mixer.music.play(-1)
-            await asyncio.sleep(0)
-            continue
+def note_quality(tier):
+    profiler.note("quality", TIER_NAMES[tier])
+
+note_quality(quality.tier)
+quality.listeners.append(note_quality)
+
+def interpolated():
+    """Player x, y, obstacle x shift and laser x as of `lag` after the last step.
+
+    Only the LOW quality tier renders slower than the sim steps; at the
+    others this is just the current state.
+    """
+    px, py, lx = sim.player_x, sim.player_y, sim.laser.x
+    if quality.tier < LOW or previous is None:
+        return px, py, 0.0, lx
+    back = 1 - lag / sim.dt
+    prev_x, prev_y, prev_scroll, prev_lx = previous
+    # A vertical wrap is a jump, not a move
+    if abs(py - prev_y) < PLAYER_SIZE:
+        px, py = px - (px - prev_x) * back, py - (py - prev_y) * back
+    if prev_lx is not None and sim.laser:
+        lx -= (lx - prev_lx) * back
+    return px, py, (sim.obstacles.scroll - prev_scroll) * back, lx
+
+# Scenes: each screen is drawn and updated by the one main loop below,
+# so nothing ever blocks the browser's event loop
+class Start(Scene):
+    static = True
+
+    def update(self, dt):
+        if not loader.done():
+            loader.poll()
+            scenes.redraw()
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN and loader.done():
+                scenes.switch(playing)
+            elif event.key == pygame.K_m:
+                toggle_mute()
+
+    def draw(self):
+        show_start()
+
+class Playing(Scene):
+    @property
+    def fps(self):
+        return quality.frame_rate(FPS)
+
+    def enter(self):
+        global lag, previous
+        lag, previous = 0.0, None
+        quality.reset()
+        renderer.invalidate()
+
+    def exit(self):
+        clock.pause(False)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            toggle_mute()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            clock.toggle_pause()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle()
+
+    def update(self, dt):
+        # Fixed-timestep update: step the simulation once per elapsed dt
+        global lag, previous
+        if not clock.paused:
+            quality.update(clock.work, clock.real_dt, self.fps)
+        buttons = read_buttons(pygame.key.get_pressed())
+        profiler.lap("input")
+        lag = min(lag + dt, MAX_STEPS_PER_FRAME * sim.dt)
+        while lag >= sim.dt and not sim.crashed:
+            previous = sim.positions()
+            sim.step(buttons)
+            lag -= sim.dt
+        profiler.lap("simulation")
+        if sim.crashed:
+            scenes.switch(game_over)
+
+    def draw(self):
+        renderer.begin()
+        px, py, shift, lx = interpolated()
+        renderer.blit(andreas_img, (px, py))
+        for ox, oy, kind, _ in sim.obstacles:
+            renderer.blit(obstacle_images[kind], (ox + shift, oy))
+        if sim.laser:
+            renderer.rect(BLACK, (lx, sim.laser.y, *LASER_SIZE))
+        if sim.maddie_visible():
+            text_x = SCREEN_WIDTH - 270
+            renderer.mark(draw_text("IT'S MY SPECIAL", text_x, 120, small_font))
+            renderer.mark(draw_text("DAY!!!", text_x + 10, 150, small_font))
+            renderer.blit(maddie_img, (SCREEN_WIDTH - 220, SCREEN_HEIGHT // 2 - 100))
+
+        renderer.mark(draw_counter("Tasks avoided: ", sim.tasks_avoided, 20, 20))
+        if clock.paused:
+            renderer.mark(draw_text("PAUSED", SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2))
+        if profiler.visible:
+            renderer.mark(profiler.draw(screen, small_font))
+        profiler.lap("draw")
+
+        # Only what was drawn this frame or the last reaches the display
+        renderer.end()
+        profiler.lap("display")
+
+class GameOver(Scene):
+    static = True
+    duration = 3
+
+    def enter(self):
+        pygame.mixer.music.stop()
+        if not IS_WEB:
+            try:
+                recorder.replay(sim.tasks_avoided).save(REPLAY_FILE)
+            except OSError as e:
+                print(f"Replay save error: {e}")
 
+    def draw(self):
         screen.fill(WHITE)
-        handle_input()
-        wrap_player()
-        spawn_obstacle()
-        update_obstacles()
-        update_laser()
-
-        if 15 < time.time() - special_event_timer < 45:
-            speed_up()
-        if handle_special_event():
-            special_event_timer = time.time()
-            special_event_interval = random.randint(20, 30)
-
-        if time.time() > boost_end_time:
-            spawn_rate = normal_spawn_rate
-
-        if check_collisions():
-            reset_game()
-            await asyncio.sleep(0)
-            continue
-
-        screen.blit(andreas_img, (player_x, player_y))
-        for obstacle in obstacles:
-            screen.blit(obstacle[2], (obstacle[0], obstacle[1]))
-        if laser:
-            pygame.draw.rect(screen, BLACK, (*laser, *LASER_SIZE))
-        if time.time() - maddie_display_time < 5:
-            text_x = SCREEN_WIDTH - 270
-            draw_text("IT'S MY SPECIAL", text_x, 120, small_font)
-            draw_text("DAY!!!", text_x + 10, 150, small_font)
-            screen.blit(maddie_img, (SCREEN_WIDTH - 220, SCREEN_HEIGHT // 2 - 100))
+        draw_text("Oops. Responsibility caught up with Andreas.", 100, SCREEN_HEIGHT // 2 - 40)
+        pygame.display.update()
 
-        draw_text(f"Tasks avoided: {tasks_avoided}", 20, 20)
+    def timeout(self):
+        qualifies = len(leaderboard) < 5 or sim.tasks_avoided > leaderboard[-1][1]
+        scenes.switch(initials if qualifies else leaderboard_screen)
+
+class Initials(Scene):
+    static = True
+
+    def enter(self):
+        self.name = ""
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.unicode.upper() in string.ascii_uppercase and len(self.name) < 3:
+                self.name += event.unicode.upper()
+            elif event.key == pygame.K_BACKSPACE:
+                self.name = self.name[:-1]
+            scenes.redraw()
+        if len(self.name) == 3:
+            leaderboard.append((self.name, sim.tasks_avoided))
+            leaderboard.sort(key=lambda x: x[1], reverse=True)
+            leaderboard[:] = leaderboard[:5]
+            save_leaderboard()
+            scenes.switch(leaderboard_screen)
+
+    def draw(self):
+        screen.fill(WHITE)
+        draw_text("Enter Your Initials:", 120, SCREEN_HEIGHT // 2 - 40)
+        draw_text(self.name, 120, SCREEN_HEIGHT // 2)
+        pygame.display.update()
 
+class Leaderboard(Scene):
+    static = True
+    restart_delay = 1
+
+    def enter(self):
+        self.duration = None
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN and self.duration is None:
+            # Keep the board up a moment before play resumes
+            sim.reset()
+            if not mute:
+                pygame.mixer.music.play(-1)
+            self.duration = scenes.elapsed + self.restart_delay
+
+    def draw(self):
+        screen.fill(BLACK)
+        draw_text("LEADERBOARD - TASKS AVOIDED", 100, 100, font, WHITE)
+        for i, entry in enumerate(leaderboard):
+            name, score = entry
+            draw_text(f"{i+1}. {name} - {score}", 120, 150 + i * 40, font, WHITE)
+        draw_text("Press Enter to Restart", 120, 400, font, WHITE)
         pygame.display.update()
-        clock.tick(FPS)
 
-        for event in pygame.event.get():
+    def timeout(self):
+        scenes.switch(playing)
+
+start, playing, game_over = Start(), Playing(), GameOver()
+initials, leaderboard_screen = Initials(), Leaderboard()
+scenes = SceneMachine(start)
+
+# Main loop
+async def main():
+    global running, frame_time
+
+    while running:
+        profiler.begin_frame()
+        events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
-                mute = not mute
-                if mute:
-                    pygame.mixer.music.pause()
-                else:
-                    pygame.mixer.music.unpause()
-                    if not pygame.mixer.music.get_busy():
-                        pygame.mixer.music.play(-1)
-
+        scenes.frame(events, frame_time)
+        profiler.end_frame()
+        frame_time = clock.tick(scenes.fps)
         await asyncio.sleep(0)
 
+    profiler.save()
     pygame.quit()
 
 # Run the game
@@ -0,0 +1,171 @@
+# Maze helpers for Maddie Paddy
+
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
+from operator import add
+
+import pygame
+
+# Byte table mapping a pixel's OR-ed RGB value to 1 (black, walkable) or 0 (wall)
+WALKABLE_TABLE = bytes([1] + [0] * 255)
+
+
+def erode(mask, k, step):
+    """AND together k copies of a cell mask, each shifted one cell further by `step` bits."""
+    have = 1
+    while have < k:
+        span = min(have, k - have)
+        mask &= mask >> (span * step)
+        have += span
+    return mask
+
+
+class WalkGrid:
+    """Walkability bitmap of a maze image with a summed-area table.
+
+    The grid is built once from the unzoomed maze; queries take coordinates
+    in the zoomed maze and cost four table lookups whatever the rect size.
+    """
+
+    def __init__(self, surface, zoom=1):
+        self.zoom = zoom
+        self.cols, self.rows = surface.get_size()
+        self.width, self.height = self.cols * zoom, self.rows * zoom
+
+        # A pixel is walkable when it is pure black, i.e. r | g | b == 0
+        rgb = pygame.image.tobytes(surface, "RGB")
+        n = self.cols * self.rows
+        combined = (int.from_bytes(rgb[0::3]) | int.from_bytes(rgb[1::3]) | int.from_bytes(rgb[2::3]))
+        self.walkable = combined.to_bytes(n).translate(WALKABLE_TABLE)
+
+        # sat[y * (cols + 1) + x] = walkable cells in the raw rect [0, x) x [0, y)
+        stride = self.cols + 1
+        self.sat = sat = array("i", bytes(4 * stride))
+        prev = sat[0:stride]
+        for y in range(self.rows):
+            row = array("i", map(add, prev, accumulate(self.walkable[y * self.cols:(y + 1) * self.cols], initial=0)))
+            sat.extend(row)
+            prev = row
+
+        self.spawns = {}
+
+    def count(self, x0, y0, x1, y1):
+        """Walkable raw cells in [x0, x1) x [y0, y1)."""
+        sat, stride = self.sat, self.cols + 1
+        return sat[y1 * stride + x1] - sat[y0 * stride + x1] - sat[y1 * stride + x0] + sat[y0 * stride + x0]
+
+    def is_walkable(self, x, y, w, h):
+        """True if the zoomed rect (x, y, w, h) lies in the maze and is all black."""
+        if w <= 0 or h <= 0:
+            return True
+        if x < 0 or y < 0 or x + w > self.width or y + h > self.height:
+            return False
+        z = self.zoom
+        x0, y0 = x // z, y // z
+        x1, y1 = (x + w - 1) // z + 1, (y + h - 1) // z + 1
+        return self.count(x0, y0, x1, y1) == (x1 - x0) * (y1 - y0)
+
+    def find_spawn(self, w, h, reverse=False):
+        """First zoomed (x, y) in row-major scan order where a w-by-h rect fits, or None.
+
+        Scans the same range as a brute-force search over the zoomed maze
+        (reversed if asked) but tests whole rows at once against an eroded
+        copy of the walkable mask. Results are cached per (w, h, reverse).
+        """
+        key = (w, h, reverse)
+        if key not in self.spawns:
+            self.spawns[key] = self._search_spawn(w, h, reverse)
+        return self.spawns[key]
+
+    def _search_spawn(self, w, h, reverse):
+        z, cols, rows = self.zoom, self.cols, self.rows
+        # One byte per cell, with a zero pad after each row so blocks cannot wrap
+        stride = cols + 1
+        padded = b"".join(self.walkable[y * cols:(y + 1) * cols] + b"\0" for y in range(rows))
+        mask = int.from_bytes(padded, "little")
+        eroded = {}
+
+        def block_rows(kx, ky):
+            # Byte string with 1 wherever a kx-by-ky raw block starting there is walkable
+            if (kx, ky) not in eroded:
+                m = erode(erode(mask, kx, 8), ky, 8 * stride)
+                eroded[kx, ky] = m.to_bytes(len(padded), "little")
+            return eroded[kx, ky]
+
+        # A zoomed span starting at offset o within a raw cell covers a fixed number of cells
+        spans_x = [(o, (o + w - 1) // z + 1) for o in range(z)]
+        ys = range(self.height - h, 0, -1) if reverse else range(0, self.height - h)
+        x_lo, x_hi = (1, self.width - w) if reverse else (0, self.width - w - 1)
+        for y in ys:
+            r, oy = divmod(y, z)
+            ky = (oy + h - 1) // z + 1
+            if r + ky > rows:
+                continue
+            best = None
+            for o, kx in spans_x:
+                c_lo, c_hi = max(0, -((o - x_lo) // z)), min(cols - kx, (x_hi - o) // z)
+                if c_lo > c_hi:
+                    continue
+                cells, base = block_rows(kx, ky), r * stride
+                c = (cells.rfind if reverse else cells.find)(1, base + c_lo, base + c_hi + 1)
+                if c >= 0:
+                    x = (c - base) * z + o
+                    if best is None or (x > best if reverse else x < best):
+                        best = x
+            if best is not None:
+                return best, y
+        return None
+
+
+class MazeTiles:
+    """The zoomed maze, cut into square tiles that are scaled on demand.
+
+    Only the unzoomed image is kept whole. A tile is zoomed from it the
+    first time it comes into view, and once more than `max_tiles` are held
+    the least recently drawn one is dropped, so memory stays bounded
+    however big the maze is. draw() blits just the tiles the camera can
+    see. `tile` is rounded down to a multiple of `zoom` so that every tile
+    is scaled from whole raw pixels.
+    """
+
+    def __init__(self, surface, zoom=1, tile=256, max_tiles=48):
+        self.raw = surface
+        self.zoom = zoom
+        self.raw_tile = max(1, tile // zoom)
+        self.tile = self.raw_tile * zoom
+        cols, rows = surface.get_size()
+        self.width, self.height = cols * zoom, rows * zoom
+        self.cols = -(-cols // self.raw_tile)
+        self.rows = -(-rows // self.raw_tile)
+        self.max_tiles = max_tiles
+        self.tiles = OrderedDict()
+
+    def get_rect(self):
+        return pygame.Rect(0, 0, self.width, self.height)
+
+    def get_tile(self, col, row):
+        key = (col, row)
+        tile = self.tiles.get(key)
+        if tile is None:
+            n, z = self.raw_tile, self.zoom
+            src = pygame.Rect(col * n, row * n, n, n).clip(self.raw.get_rect())
+            tile = pygame.transform.scale(self.raw.subsurface(src), (src.width * z, src.height * z))
+            self.tiles[key] = tile
+            if len(self.tiles) > self.max_tiles:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(key)
+        return tile
+
+    def draw(self, surface, cam_x, cam_y):
+        """Blit the view of the maze whose top-left corner is at (cam_x, cam_y)."""
+        cam_x, cam_y = int(cam_x), int(cam_y)
+        w, h = surface.get_size()
+        t = self.tile
+        for row in range(max(0, cam_y // t), min(self.rows, (cam_y + h - 1) // t + 1)):
+            for col in range(max(0, cam_x // t), min(self.cols, (cam_x + w - 1) // t + 1)):
+                surface.blit(self.get_tile(col, row), (col * t - cam_x, row * t - cam_y))
+
+    def clear(self):
+        self.tiles.clear()
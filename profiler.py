@@ -0,0 +1,156 @@
+# Frame-time profiler and overlay
+#
+# Cheap enough to leave on: a frame costs one perf_counter() call per
+# lap or wrapped call and a few array stores. Percentiles are only
+# computed when the overlay refreshes or on export. Set GAME_PROFILE to a
+# .csv or .json path to have the games write a summary there at exit.
+
+import json
+import os
+from array import array
+from functools import wraps
+from itertools import repeat
+from time import perf_counter
+
+import pygame
+
+EXPORT_PATH = os.environ.get("GAME_PROFILE")
+PERCENTILES = (50, 95, 99)
+
+
+class Profiler:
+    """Rolling per-section timings over the last `window` frames.
+
+    Between begin_frame() and end_frame(), lap(name) charges the time since
+    the previous lap (or the start of the frame) to `name`, and methods
+    wrapped with wrap() charge their own running time. A section used more
+    than once in a frame is summed. end_frame() records the frame's totals,
+    plus the whole frame as 'frame', into ring buffers; frames with no laps
+    (menus) are not recorded. note() attaches a named value, such as the
+    active quality tier, that the overlay and exports show alongside.
+    """
+
+    def __init__(self, window=300, refresh=0.5):
+        self.window = window
+        self.refresh = refresh
+        self.samples = {}
+        self.totals = {}
+        self.info = {}
+        self.frames = 0
+        self.visible = False
+        self.frame_start = self.last = 0.0
+        self.overlay = None
+        self.overlay_time = -refresh
+
+    def begin_frame(self):
+        self.frame_start = self.last = perf_counter()
+
+    def lap(self, name):
+        now = perf_counter()
+        self.totals[name] = self.totals.get(name, 0.0) + now - self.last
+        self.last = now
+
+    def add(self, name, seconds):
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+
+    def wrap(self, obj, method, name=None):
+        """Time every call of `obj.method` under `name` (the method name by default)."""
+        name = name or method
+        func = getattr(obj, method)
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, perf_counter() - start)
+        setattr(obj, method, timed)
+
+    def note(self, name, value):
+        self.info[name] = value
+        self.overlay_time = -self.refresh
+
+    def end_frame(self):
+        totals = self.totals
+        if not totals:
+            return
+        totals['frame'] = perf_counter() - self.frame_start
+        i = self.frames % self.window
+        for name, seconds in totals.items():
+            ring = self.samples.get(name)
+            if ring is None:
+                ring = self.samples[name] = array('d', repeat(0.0, self.window))
+            ring[i] = seconds
+        for name in self.samples.keys() - totals.keys():
+            self.samples[name][i] = 0.0
+        self.frames += 1
+        totals.clear()
+
+    # --- Reporting ---
+    def stats(self):
+        """{section: {'p50', 'p95', 'p99', 'mean', 'max'}} in milliseconds."""
+        n = min(self.frames, self.window)
+        result = {}
+        for name, ring in self.samples.items():
+            values = sorted(ring[:n])
+            if not values:
+                continue
+            row = {f"p{p}": round(values[min(n - 1, n * p // 100)] * 1000, 3) for p in PERCENTILES}
+            row['mean'] = round(sum(values) / n * 1000, 3)
+            row['max'] = round(values[-1] * 1000, 3)
+            result[name] = row
+        return result
+
+    def export(self, path):
+        """Write stats() to `path` as JSON, or CSV unless it ends in .json."""
+        stats = self.stats()
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                json.dump({"frames": self.frames, "info": self.info, "sections": stats}, f, indent=2)
+            else:
+                for name, value in self.info.items():
+                    f.write(f"# {name}: {value}\n")
+                f.write("section,p50_ms,p95_ms,p99_ms,mean_ms,max_ms\n")
+                for name, row in stats.items():
+                    f.write(",".join([name] + [f"{row[k]:.3f}" for k in ("p50", "p95", "p99", "mean", "max")]) + "\n")
+
+    def save(self):
+        """Export to $GAME_PROFILE, if set."""
+        if EXPORT_PATH:
+            try:
+                self.export(EXPORT_PATH)
+            except OSError as e:
+                print(f"Profile export error: {e}")
+
+    # --- Overlay ---
+    def toggle(self):
+        self.visible = not self.visible
+        self.overlay_time = -self.refresh
+
+    def draw(self, surface, font, pos=(10, 50), color=(255, 255, 0)):
+        """Blit the overlay, re-rendered every `refresh` seconds; returns its rect."""
+        now = perf_counter()
+        if now - self.overlay_time >= self.refresh:
+            self.overlay_time = now
+            rows = [["ms"] + [f"p{p}" for p in PERCENTILES]]
+            for name, row in sorted(self.stats().items()):
+                rows.append([name] + [f"{row[f'p{p}']:.2f}" for p in PERCENTILES])
+            rows += [[f"{name}: {value}"] for name, value in self.info.items()]
+            cells = [[font.render(text, True, color) for text in row] for row in rows]
+            height = font.get_linesize()
+            name_width = max(row[0].get_width() for row in cells)
+            column = max(cell.get_width() for row in cells for cell in row[1:]) + 12
+            width = name_width + column * len(PERCENTILES)
+            self.overlay = pygame.Surface((width + 8, height * len(rows) + 8), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 180))
+            for i, row in enumerate(cells):
+                y = 4 + i * height
+                self.overlay.blit(row[0], (4, y))
+                # Numbers right-aligned in their columns
+                for j, cell in enumerate(row[1:], 1):
+                    self.overlay.blit(cell, (4 + name_width + column * j - cell.get_width(), y))
+        return surface.blit(self.overlay, pos)
+
+
+profiler = Profiler()
@@ -0,0 +1,88 @@
+# Adaptive quality governor
+#
+# A slow machine (the pygbag build on a Chromebook, say) can't always hold
+# 60 fps. Rather than let the game fall behind, the governor watches each
+# frame's work time and drops optional rendering features a tier at a time
+# while frames run over budget, then restores them once there is room
+# again. Set GAME_QUALITY to high, medium or low to pin a tier.
+
+import os
+from collections import deque
+
+HIGH, MEDIUM, LOW = 0, 1, 2
+TIER_NAMES = ("high", "medium", "low")
+
+
+class QualityGovernor:
+    """Picks a quality tier from recent frame times.
+
+    HIGH draws everything. MEDIUM drops per-frame extras such as the laser
+    trail and the blended torch fog. LOW also drops the background image
+    and halves the render rate; the games keep stepping their simulation
+    at the full rate and draw positions interpolated between steps, so
+    play speed holds.
+
+    update() takes the time the frame spent working (excluding the wait
+    for the next tick), the real time since the last frame and the frame
+    rate in effect. Once `window` frames are in, a frame counts as slow if
+    its work took more than `over` of the frame period or it arrived a
+    quarter late; if half the window is slow the tier drops. It rises again
+    when the mean work would fit in `under` of the full-rate budget for
+    `settle` seconds. Listeners are called as `listener(tier)` on changes.
+    """
+
+    def __init__(self, fps=60, window=60, over=0.9, under=0.5, settle=5.0, tier=HIGH):
+        self.budget = 1 / fps
+        self.window = window
+        self.over = over
+        self.under = under
+        self.settle = settle
+        self.work = deque(maxlen=window)
+        self.slow = deque(maxlen=window)
+        self.calm = 0.0
+        self.listeners = []
+        pinned = os.environ.get("GAME_QUALITY")
+        self.pinned = pinned in TIER_NAMES
+        self.tier = TIER_NAMES.index(pinned) if self.pinned else tier
+
+    @property
+    def name(self):
+        return TIER_NAMES[self.tier]
+
+    def frame_rate(self, fps):
+        """The render rate to tick at for a game designed for `fps`."""
+        return fps // 2 if self.tier >= LOW else fps
+
+    def reset(self):
+        """Forget frame times, e.g. after a menu, keeping the tier."""
+        self.work.clear()
+        self.slow.clear()
+        self.calm = 0.0
+
+    def set_tier(self, tier):
+        tier = max(HIGH, min(tier, LOW))
+        if tier != self.tier:
+            self.tier = tier
+            self.reset()
+            for listener in self.listeners:
+                listener(tier)
+
+    def update(self, work, real_dt, fps):
+        if self.pinned:
+            return
+        period = 1 / fps
+        self.work.append(work)
+        self.slow.append(work > self.over * period or real_dt > 1.25 * period)
+        if len(self.slow) < self.window:
+            return
+        if sum(self.slow) * 2 >= self.window:
+            self.set_tier(self.tier + 1)
+        elif self.tier > HIGH and sum(self.work) / len(self.work) < self.under * self.budget:
+            self.calm += real_dt
+            if self.calm >= self.settle:
+                self.set_tier(self.tier - 1)
+        else:
+            self.calm = 0.0
+
+
+quality = QualityGovernor()
@@ -0,0 +1,70 @@
+# Dirty-rectangle rendering
+
+import pygame
+
+
+class DirtyRenderer:
+    """Redraws and pushes only the parts of the screen that changed.
+
+    Everything drawn between begin() and end() goes through blit(), draw
+    calls or mark(), which record its bounding rect. The next begin()
+    restores just those rects from `background` (a surface the size of the
+    screen, or a fill color), and end() updates the display with this
+    frame's rects plus last frame's, so things that moved or vanished are
+    cleared too. invalidate() forces one full redraw, e.g. after another
+    screen has drawn over everything.
+    """
+
+    def __init__(self, screen, background=(0, 0, 0)):
+        self.screen = screen
+        self.background = background
+        self.previous = []
+        self.current = []
+        self.full = True
+
+    def invalidate(self):
+        self.full = True
+
+    def restore(self, rect=None):
+        if isinstance(self.background, pygame.Surface):
+            if rect is None:
+                self.screen.blit(self.background, (0, 0))
+            else:
+                self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.background, rect)
+
+    def begin(self):
+        if self.full:
+            self.restore()
+        else:
+            for rect in self.previous:
+                self.restore(rect)
+        self.current = []
+
+    def mark(self, rect):
+        """Record an area drawn some other way; returns it."""
+        if rect.width and rect.height:
+            self.current.append(rect)
+        return rect
+
+    def blit(self, surface, pos):
+        return self.mark(self.screen.blit(surface, pos))
+
+    def rect(self, color, rect):
+        return self.mark(pygame.draw.rect(self.screen, color, rect))
+
+    def circle(self, color, center, radius):
+        return self.mark(pygame.draw.circle(self.screen, color, center, radius))
+
+    def end(self):
+        """Push this frame to the display; returns the rects updated (None for all)."""
+        if self.full:
+            dirty = None
+            pygame.display.update()
+            self.full = False
+        else:
+            dirty = self.previous + self.current
+            pygame.display.update(dirty)
+        self.previous = self.current
+        return dirty
@@ -0,0 +1,146 @@
+# Input recording and deterministic replay for the dodger games
+#
+# A round of DodgerSim is fully determined by its rules, its seed and the
+# button bitmask of every fixed-timestep step, so that is all a replay
+# stores: a small header plus the zlib-compressed bitmasks, one byte per
+# step. `python replay.py FILE` re-runs a recording headless, as fast as
+# it can, and checks the final score against the recorded one.
+
+import argparse
+import math
+import struct
+import sys
+import zlib
+from time import perf_counter
+
+from dodger_sim import ClassicDodgerSim, DodgerSim, FPS
+
+MAGIC = b"SDDR"
+VERSION = 1
+# magic, version, rules, seed, dt, steps, recorded score (-1 if none)
+HEADER = struct.Struct("<4sB8sQdIi")
+RULES = {"dodger": DodgerSim, "classic": ClassicDodgerSim}
+
+
+class Replay:
+    """One recorded round: rules name, seed, step length and per-step buttons."""
+
+    def __init__(self, rules, seed, buttons, dt=1 / FPS, score=None):
+        self.rules = rules
+        self.seed = seed
+        self.buttons = bytes(buttons)
+        self.dt = dt
+        self.score = score
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.rules.encode(), self.seed, self.dt,
+                             len(self.buttons), -1 if self.score is None else self.score)
+        return header + zlib.compress(self.buttons, 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("not a replay file: too short")
+        magic, version, rules, seed, dt, steps, score = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a replay file, or an unsupported version")
+        try:
+            buttons = zlib.decompress(data[HEADER.size:])
+        except zlib.error as e:
+            raise ValueError(f"replay is truncated or corrupt: {e}") from None
+        if len(buttons) != steps:
+            raise ValueError(f"replay is truncated: {len(buttons)} of {steps} steps")
+        rules = rules.rstrip(b"\0").decode(errors="replace")
+        if rules not in RULES:
+            raise ValueError(f"replay has unknown rules {rules!r}")
+        if not 0 < dt < math.inf:
+            raise ValueError(f"replay has an invalid step length {dt}")
+        return cls(rules, seed, buttons, dt, None if score < 0 else score)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def play(self, sim=None):
+        """Feed the recording through `sim` (a fresh sim for its rules by default); returns the sim."""
+        if sim is None:
+            sim = RULES[self.rules](dt=self.dt)
+        sim.reset(self.seed)
+        step = sim.step
+        for buttons in self.buttons:
+            step(buttons)
+        return sim
+
+    def verify(self):
+        """True if replaying reproduces the recorded score."""
+        return self.play().tasks_avoided == self.score
+
+
+class Recorder:
+    """Sim listener that records the buttons of every step of the current round.
+
+    A round starts with the first step after DodgerSim.reset(), so the
+    recording always matches the sim's current seed.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.seed = 0
+        self.dt = 1 / FPS
+        self.buttons = bytearray()
+
+    def __call__(self, sim, events):
+        if sim.ticks == 1:
+            self.seed, self.dt = sim.seed, sim.dt
+            self.buttons.clear()
+        self.buttons.append(sim.buttons)
+
+    def replay(self, score=None):
+        return Replay(self.rules, self.seed, self.buttons, self.dt, score)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded dodger round headless.")
+    parser.add_argument("file")
+    parser.add_argument("--profile", action="store_true", help="report the slowest steps")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.file)
+    sim = RULES[replay.rules](dt=replay.dt)
+    slowest = []
+    if args.profile:
+        step = sim.step
+        def timed_step(buttons=0):
+            start = perf_counter()
+            step(buttons)
+            slowest.append((perf_counter() - start, sim.ticks, len(sim.obstacles)))
+        sim.step = timed_step
+
+    start = perf_counter()
+    replay.play(sim)
+    elapsed = perf_counter() - start
+
+    print(f"{replay.rules} seed {replay.seed}: {len(replay)} steps in {elapsed:.3f}s "
+          f"({len(replay) * replay.dt / max(elapsed, 1e-9):.0f}x real time)")
+    print(f"score {sim.tasks_avoided}, {'crashed' if sim.crashed else 'no crash'}")
+    for seconds, tick, obstacles in sorted(slowest, reverse=True)[:10]:
+        print(f"  step {tick}: {seconds * 1000:.3f} ms, {obstacles} obstacles")
+    if replay.score is None:
+        return 0
+    if sim.tasks_avoided != replay.score:
+        print(f"MISMATCH: recorded score {replay.score}")
+        return 1
+    print("score verified")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Scene state machine for the game loops
+
+class Scene:
+    """One screen of a game: start menu, play, game over, leaderboard...
+
+    The game's single main loop passes the current scene its events and
+    calls update(dt) and draw() once a frame, so no screen ever blocks the
+    loop. A scene with a `duration` (seconds) gets timeout() once it has
+    been showing that long; timeout() is expected to switch scenes. Static
+    scenes are only drawn on entry and after SceneMachine.redraw(). `fps`
+    is the frame rate the loop should tick at while the scene shows.
+    """
+
+    duration = None
+    static = False
+    fps = 30
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def handle(self, event):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def draw(self):
+        pass
+
+    def timeout(self):
+        pass
+
+
+class SceneMachine:
+    """Holds the current scene and runs one frame of it at a time."""
+
+    def __init__(self, scene=None):
+        self.scene = None
+        self.elapsed = 0.0
+        self.dirty = True
+        if scene is not None:
+            self.switch(scene)
+
+    def switch(self, scene):
+        if self.scene is not None:
+            self.scene.exit()
+        self.scene = scene
+        self.elapsed = 0.0
+        self.dirty = True
+        scene.enter()
+
+    def redraw(self):
+        self.dirty = True
+
+    @property
+    def fps(self):
+        return self.scene.fps
+
+    def frame(self, events, dt):
+        """Handle `events`, update by `dt` seconds and draw if needed; returns True if drawn."""
+        for event in events:
+            self.scene.handle(event)
+        scene = self.scene
+        self.elapsed += dt
+        scene.update(dt)
+        if scene is self.scene and scene.duration is not None and self.elapsed >= scene.duration:
+            scene.timeout()
+        scene = self.scene
+        if self.dirty or not scene.static:
+            self.dirty = False
+            scene.draw()
+            return True
+        return False
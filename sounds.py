@@ -0,0 +1,104 @@
+# Preloaded sound effects
+
+import os
+from collections import deque
+
+import pygame
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+AUDIO_PATH = os.path.join(BASE_PATH, "audio")
+
+
+class SoundBank:
+    """Sound effects decoded once and played on a fixed pool of channels.
+
+    Effects are registered with add() and decoded by load(), which can run
+    on an AssetLoader thread. play() only picks a channel: each effect keeps
+    at most `voices` copies playing, retriggering its oldest one beyond
+    that, and when the whole pool is busy the longest-playing channel is
+    taken over.
+    """
+
+    def __init__(self, channels=8, path=AUDIO_PATH):
+        self.path = path
+        self.num_channels = channels
+        self.entries = {}
+        self.sounds = {}
+        self.playing = {}
+        self.owners = {}
+        self.pool = deque()
+
+    def add(self, name, files, volume=1.0, voices=1):
+        """Register effect `name`; `files` is a file name, or several tried in order."""
+        if isinstance(files, str):
+            files = (files,)
+        self.entries[name] = (files, volume, voices)
+        self.playing[name] = deque(maxlen=voices)
+
+    def decode(self, files, volume):
+        error = None
+        for file in files:
+            try:
+                sound = pygame.mixer.Sound(os.path.join(self.path, file))
+            except Exception as e:
+                error = e
+                continue
+            sound.set_volume(volume)
+            return sound
+        raise error
+
+    def load(self):
+        """Decode every registered effect; effects that fail to load stay silent."""
+        if not pygame.mixer.get_init():
+            return self
+        if not self.pool:
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.num_channels))
+            pygame.mixer.set_reserved(self.num_channels)
+            self.pool.extend(pygame.mixer.Channel(i) for i in range(self.num_channels))
+        for name, (files, volume, _) in self.entries.items():
+            if name not in self.sounds:
+                try:
+                    self.sounds[name] = self.decode(files, volume)
+                except Exception as e:
+                    print(f"Sound load error ({name}): {e}")
+        return self
+
+    def channel(self):
+        # Least recently started channel first; an idle one if there is any
+        pool = self.pool
+        for i, channel in enumerate(pool):
+            if not channel.get_busy():
+                del pool[i]
+                break
+        else:
+            channel = pool.popleft()
+        pool.append(channel)
+        owner = self.owners.get(channel)
+        if owner is not None and channel in owner:
+            owner.remove(channel)
+        return channel
+
+    def play(self, name):
+        """Play effect `name`; returns the channel, or None if it isn't loaded."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        playing = self.playing[name]
+        # Copies finish oldest first, so finished ones are at the front
+        while playing and playing[0].get_sound() is not sound:
+            playing.popleft()
+        if len(playing) == playing.maxlen:
+            channel = playing.popleft()
+            channel.stop()
+            self.pool.remove(channel)
+            self.pool.append(channel)
+        else:
+            channel = self.channel()
+        channel.play(sound)
+        playing.append(channel)
+        self.owners[channel] = playing
+        return channel
+
+    def stop(self):
+        for channel in self.pool:
+            channel.stop()
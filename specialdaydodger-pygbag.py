@@ -1,33 +1,35 @@
 # Special Day Dodger
 
 import pygame
-import random
-import time
 import string
 import json
 import os
+import sys
+
+from assets import AssetLoader, bundle, load_image
+from dodger_sim import DodgerSim, SCREEN_WIDTH, SCREEN_HEIGHT, FPS, LEFT, RIGHT, UP, DOWN, FIRE
+from game_clock import GameClock
+from profiler import profiler
+from quality import quality, TIER_NAMES, MEDIUM, LOW
+from render import DirtyRenderer
+from replay import Recorder
+from scenes import Scene, SceneMachine
+from sounds import SoundBank
+from text_cache import text_cache
 
 # --- Constants ---
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-PLAYER_SIZE = 100
-LASER_SIZE = (5, 5)
-SPEED_INCREMENT = 0.005
-FPS = 60
+PLAYER_SIZE = DodgerSim.PLAYER_SIZE
+LASER_SIZE = DodgerSim.LASER_SIZE
+MAX_STEPS_PER_FRAME = 5
 WHITE, BLACK, RED, LIGHT_GREEN = (255, 255, 255), (0, 0, 0), (255, 0, 0), (144, 238, 144)
 LEADERBOARD_FILE = "leaderboard.json"
+REPLAY_FILE = "last_run.replay"
+IS_WEB = sys.platform == "emscripten"
 FONT_PATH = "fonts/"
 IMAGE_PATH = "images/"
 AUDIO_PATH = "audio/"
 
-OBJECT_SIZES = {
-    'flowers': 100,
-    'spreadsheet': 50,
-    'invitation': 60,
-    'rings': 40,
-    'tux': 100,
-    'list': 50,
-    'maddievillain': 200
-}
+OBJECT_SIZES = {**DodgerSim.OBJECT_SIZES, 'maddievillain': 200}
   
 
 # --- Initialization ---
@@ -35,22 +37,32 @@ pygame.init()
 pygame.mixer.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Special Day Dodger")
-clock = pygame.time.Clock()
+clock = GameClock()
 
 # --- Asset Loading ---
-def load_image(name, size):
-    return pygame.transform.scale(pygame.image.load(os.path.join(IMAGE_PATH, name)), size)
-
 def load_assets():
     assets = {name: load_image(f"{name}.png", (size, size)) for name, size in OBJECT_SIZES.items()}
     assets['player'] = load_image("andreas.png", (PLAYER_SIZE, PLAYER_SIZE))
-    assets['background_img'] = pygame.transform.scale(
-        pygame.image.load(os.path.join(IMAGE_PATH, "dodgebg.png")),
-        (SCREEN_WIDTH, SCREEN_HEIGHT)
-    )
+    assets['background_img'] = load_image("dodgebg.png", (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=False)
+    assets['background_color'] = pygame.transform.average_color(assets['background_img'])[:3]
     return assets
 
-assets = load_assets()
+assets = {}
+renderer = DirtyRenderer(screen)
+
+def finish_assets(_):
+    assets.update(load_assets())
+    apply_quality(quality.tier)
+
+def apply_quality(tier):
+    # Slow machines get a flat background, no laser trail and half-rate,
+    # interpolated rendering
+    if 'background_img' in assets:
+        renderer.background = assets['background_img'] if tier < LOW else assets['background_color']
+        renderer.invalidate()
+    profiler.note("quality", TIER_NAMES[tier])
+
+quality.listeners.append(apply_quality)
 
 # --- Fonts ---
 def get_font(size, title=False):
@@ -80,261 +92,281 @@ leaderboard = load_leaderboard()
 
 # --- Utility Functions ---
 def draw_text(text, x, y, font_obj=font, color=BLACK):
+    rect = pygame.Rect(x, y, 0, 0)
     for i, line in enumerate(text.splitlines()):
-        screen.blit(font_obj.render(line, True, color), (x, y + i * 30))
+        rect.union_ip(screen.blit(text_cache.render(font_obj, line, color), (x, y + i * 30)))
+    return rect
+
+def draw_counter(label, value, x, y, font_obj=font, color=BLACK):
+    label_surf = text_cache.render(font_obj, label, color)
+    screen.blit(label_surf, (x, y))
+    end = text_cache.draw_glyphs(screen, font_obj, str(value), (x + label_surf.get_width(), y), color)
+    return pygame.Rect(x, y, end - x, font_obj.get_height())
 
 def draw_wrapped(text, top_y, font_obj, color=WHITE):
     margin = 50
-    words, lines, current = text.split(), [], ''
-    for word in words:
-        test = f"{current} {word}".strip()
-        if font_obj.size(test)[0] <= SCREEN_WIDTH - 2 * margin:
-            current = test
-        else:
-            lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    for i, line in enumerate(lines):
-        surf = font_obj.render(line, True, color)
+    for i, line in enumerate(text_cache.wrap(font_obj, text, SCREEN_WIDTH - 2 * margin)):
+        surf = text_cache.render(font_obj, line, color)
         rect = surf.get_rect(center=(SCREEN_WIDTH // 2, top_y + i * 35))
         screen.blit(surf, rect)
 
-def play_laser_sound():
-    if mute:
-        return
-    try:
-        sound = pygame.mixer.Sound(os.path.join(AUDIO_PATH, "pew.ogg"))
-        sound.set_volume(0.5)  # Adjust volume if needed
-        sound.play()
-    except Exception as e:
-        print(f"Laser sound error: {e}")
-    except Exception as e:
-        print(f"Laser sound error: {e}")
-
-def play_special_sound():
-    if mute:
-        return
-    try:
-        special = pygame.mixer.Sound(os.path.join(AUDIO_PATH, "special_day.ogg"))
-        special.set_volume(1.0)
-        special.play()
-    except Exception as e:
-        print(f"Special sound error: {e}")
+def draw_progress(progress, y, color=WHITE):
+    width = 300
+    x = SCREEN_WIDTH // 2 - width // 2
+    pygame.draw.rect(screen, color, (x, y, width, 20), 1)
+    pygame.draw.rect(screen, color, (x + 2, y + 2, int((width - 4) * progress), 16))
+
+def play_sound(name):
+    if not mute:
+        sounds.play(name)
+
+def load_music():
+    pygame.mixer.music.load(os.path.join(AUDIO_PATH, "happy_whistle_tune.ogg"))
 
-def play_lose_sound():
+def start_music(_=None):
+    pygame.mixer.music.set_volume(0.2)
+    pygame.mixer.music.play(-1)
     if mute:
-        return
-    try:
-        sound = pygame.mixer.Sound(os.path.join(AUDIO_PATH, "lose_sound.ogg"))
-        sound.set_volume(0.7)
-        sound.play()
-    except Exception as e:
-        print(f"Lose sound error: {e}")
+        pygame.mixer.music.pause()
 
-def init_music():
-    try:
-        pygame.mixer.music.load(os.path.join(AUDIO_PATH, "happy_whistle_tune.ogg"))
-        pygame.mixer.music.set_volume(0.2)
-        pygame.mixer.music.play(-1)
-    except Exception as e:
-        print(f"Music init error: {e}")
+# Only the fonts are needed for the start screen; sprites and music load
+# in the background while it is showing.
+loader = AssetLoader()
+loader.add(bundle.preload, finish_assets)
+loader.add(load_music, start_music)
 
-init_music()
+# Sound effects are decoded once here rather than on every event
+sounds = SoundBank()
+sounds.add("pew", "pew.ogg", volume=0.5, voices=3)
+sounds.add("special", "special_day.ogg")
+sounds.add("lose", "lose_sound.ogg", volume=0.7)
+loader.add(sounds.load)
 
 # --- Game State ---
+def play_sim_sounds(sim, events):
+    if 'fire' in events:
+        play_sound("pew")
+    if 'special' in events:
+        play_sound("special")
+
+sim = DodgerSim()
+sim.listeners.append(play_sim_sounds)
+# Every round is recorded so a reported crash or score can be replayed
+recorder = Recorder("dodger")
+sim.listeners.append(recorder)
+for method in ("update_laser", "spawn_obstacle", "update_obstacles", "check_collisions"):
+    profiler.wrap(sim, method)
+mute, running = False, True
+lag, frame_time = 0.0, 0.0
+previous = None
+
 def reset_game():
-    global player_x, player_y, laser, laser_trail, obstacles
-    global obstacle_speed, spawn_rate, tasks_avoided
-    global boost_end_time, special_event_timer
-
-    player_x = 10
-    player_y = SCREEN_HEIGHT // 2 - PLAYER_SIZE // 2
-    laser = None
-    laser_trail = []
-    obstacles = []
-    obstacle_speed = 2
-    spawn_rate = 0.02
-    tasks_avoided = 0
-    boost_end_time = -10
-    special_event_timer = time.time()
-
-reset_game()
-special_event_interval = random.randint(20, 30)
-mute, running, show_start_screen = False, True, True
-maddie_display_time = -10
+    global lag, previous
+    sim.reset()
+    lag, previous = 0.0, None
+
+def toggle_mute():
+    global mute
+    mute = not mute
+    pygame.mixer.music.pause() if mute else pygame.mixer.music.unpause()
 
 # --- Game Functions ---
-def handle_input():
-    global player_x, player_y, laser, laser_trail
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-        player_x -= 5
-        if player_x < 0:
-            player_x = 0
-    if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-        player_x += 5
-        if player_x > SCREEN_WIDTH - PLAYER_SIZE:
-            player_x = SCREEN_WIDTH - PLAYER_SIZE
-    if keys[pygame.K_UP] or keys[pygame.K_w]: player_y -= 5
-    if keys[pygame.K_DOWN] or keys[pygame.K_s]: player_y += 5
-
-    # Wrap vertically if more than 35% off-screen
-    if player_y + PLAYER_SIZE * 0.35 > SCREEN_HEIGHT:
-        player_y = -PLAYER_SIZE * 0.35
-    elif player_y < -PLAYER_SIZE * 0.35:
-        player_y = SCREEN_HEIGHT - PLAYER_SIZE * 0.35
-    if keys[pygame.K_SPACE] and not laser:
-        laser = [player_x + PLAYER_SIZE // 2 - LASER_SIZE[0] // 2,
-                 player_y + PLAYER_SIZE // 2 - LASER_SIZE[1] // 2]
-        laser_trail = []
-        play_laser_sound()
-
-def update_laser():
-    global laser, laser_trail
-    if laser:
-        laser_trail.append((laser[0], laser[1]))
-        laser[0] += 7
-        if laser[0] > SCREEN_WIDTH:
-            laser = None
-            laser_trail.clear()
-
-def spawn_obstacle():
-    name = random.choice([k for k in OBJECT_SIZES if k != 'maddievillain'])
-    size = OBJECT_SIZES[name]
-    y = random.randint(0, SCREEN_HEIGHT - size)
-    img = assets[name]
-    obstacles.append([SCREEN_WIDTH, y, img, size])
-
-def update_obstacles():
-    global obstacle_speed, tasks_avoided, spawn_rate
-    for obstacle in obstacles[:]:
-        obstacle[0] -= obstacle_speed
-        if obstacle[0] + obstacle[3] < 0:
-            obstacles.remove(obstacle)
-            tasks_avoided += 1
-    obstacle_speed += SPEED_INCREMENT / FPS
-    if random.random() < spawn_rate:
-        spawn_obstacle()
-
-def check_collisions():
-    global laser, laser_trail, tasks_avoided
-    buffer = 0.2
-    px, py = player_x + PLAYER_SIZE * buffer, player_y + PLAYER_SIZE * buffer
-    psize = PLAYER_SIZE * (1 - 2 * buffer)
-    for obstacle in obstacles[:]:
-        ox, oy = obstacle[0] + obstacle[3] * buffer, obstacle[1] + obstacle[3] * buffer
-        osize = obstacle[3] * (1 - 2 * buffer)
-        if (px < ox + osize and px + psize > ox and py < oy + osize and py + psize > oy):
-            return True
-        if laser and (laser[0] + LASER_SIZE[0] > obstacle[0] and laser[0] < obstacle[0] + obstacle[3] and
-                      laser[1] < obstacle[1] + obstacle[3] and laser[1] + LASER_SIZE[1] > obstacle[1]):
-            obstacles.remove(obstacle)
-            laser = None
-            laser_trail.clear()
-            tasks_avoided += 1
-            break
-    return False
+def read_buttons(keys):
+    buttons = 0
+    if keys[pygame.K_LEFT] or keys[pygame.K_a]: buttons |= LEFT
+    if keys[pygame.K_RIGHT] or keys[pygame.K_d]: buttons |= RIGHT
+    if keys[pygame.K_UP] or keys[pygame.K_w]: buttons |= UP
+    if keys[pygame.K_DOWN] or keys[pygame.K_s]: buttons |= DOWN
+    if keys[pygame.K_SPACE]: buttons |= FIRE
+    return buttons
+
+def interpolated():
+    """Player x, y, obstacle x shift and laser x as of `lag` after the last step.
+
+    Only the LOW quality tier renders slower than the sim steps; at the
+    others this is just the current state.
+    """
+    px, py, lx = sim.player_x, sim.player_y, sim.laser.x
+    if quality.tier < LOW or previous is None:
+        return px, py, 0.0, lx
+    back = 1 - lag / sim.dt
+    prev_x, prev_y, prev_scroll, prev_lx = previous
+    # A vertical wrap is a jump, not a move
+    if abs(py - prev_y) < PLAYER_SIZE:
+        px, py = px - (px - prev_x) * back, py - (py - prev_y) * back
+    if prev_lx is not None and sim.laser:
+        lx -= (lx - prev_lx) * back
+    return px, py, (sim.obstacles.scroll - prev_scroll) * back, lx
 
 def draw_game():
-    screen.blit(assets['background_img'], (0,0))
-    screen.blit(assets['player'], (player_x, player_y))
-    for ox, oy, img, _ in obstacles:
-        screen.blit(img, (ox, oy))
-    if laser:
-        pygame.draw.rect(screen, RED, (*laser, *LASER_SIZE))
-        for i, (tx, ty) in enumerate(laser_trail[-10:]):
-            if i % 2 == 0:
-                pygame.draw.circle(screen, RED, (tx + LASER_SIZE[0] // 2, ty + LASER_SIZE[1]), 2)
-    if time.time() - maddie_display_time < 5:
-        draw_text("IT'S MY", SCREEN_WIDTH - 270, 200, font, BLACK)
-        draw_text("SPECIAL", SCREEN_WIDTH - 270, 230, font, BLACK)
-        draw_text("DAY!!!", SCREEN_WIDTH - 260, 260, font, BLACK)
-        screen.blit(assets['maddievillain'], (SCREEN_WIDTH - 220, SCREEN_HEIGHT // 2 - 100))
-    draw_text(f"Tasks avoided: {tasks_avoided}", 20, 20, font, BLACK)
-    pygame.display.update()
-
-# --- Game Loop ---
-while running:
-    if show_start_screen:
+    # Only the areas drawn this frame or the last are restored and pushed
+    renderer.begin()
+    px, py, shift, lx = interpolated()
+    renderer.blit(assets['player'], (px, py))
+    for ox, oy, kind, _ in sim.obstacles:
+        renderer.blit(assets[kind], (ox + shift, oy))
+    if sim.laser:
+        renderer.rect(RED, (lx, sim.laser.y, *LASER_SIZE))
+        if quality.tier < MEDIUM:
+            for i, (tx, ty) in enumerate(sim.laser_trail):
+                if i % 2 == 0:
+                    renderer.circle(RED, (tx + LASER_SIZE[0] // 2, ty + LASER_SIZE[1]), 2)
+    if sim.maddie_visible():
+        renderer.mark(draw_text("IT'S MY", SCREEN_WIDTH - 270, 200, font, BLACK))
+        renderer.mark(draw_text("SPECIAL", SCREEN_WIDTH - 270, 230, font, BLACK))
+        renderer.mark(draw_text("DAY!!!", SCREEN_WIDTH - 260, 260, font, BLACK))
+        renderer.blit(assets['maddievillain'], (SCREEN_WIDTH - 220, SCREEN_HEIGHT // 2 - 100))
+    renderer.mark(draw_counter("Tasks avoided: ", sim.tasks_avoided, 20, 20, font, BLACK))
+    if clock.paused:
+        renderer.mark(draw_text("PAUSED", SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2, font, BLACK))
+    if profiler.visible:
+        renderer.mark(profiler.draw(screen, small_font))
+    profiler.lap("draw")
+    renderer.end()
+    profiler.lap("display")
+
+# --- Scenes ---
+class Start(Scene):
+    static = True
+
+    def update(self, dt):
+        if not loader.done():
+            loader.poll()
+            scenes.redraw()
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN and loader.done():
+                scenes.switch(playing)
+            elif event.key == pygame.K_m:
+                toggle_mute()
+
+    def draw(self):
         screen.fill(BLACK)
         draw_wrapped("Special Day Dodger", 200, title_font, WHITE)
         draw_wrapped("Help Andreas avoid his wedding responsibilities.", 300, font, WHITE)
-        draw_wrapped("Arrows to move. Space to shoot. M to mute.", 350, font, WHITE)
-        draw_wrapped("Press Enter to Start", 450, font, WHITE)
+        draw_wrapped("Arrows to move. Space to shoot. P to pause. M to mute.", 350, font, WHITE)
+        if loader.done():
+            draw_wrapped("Press Enter to Start", 450, font, WHITE)
+        else:
+            draw_progress(loader.progress(), 450)
         pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    show_start_screen = False
-                elif event.key == pygame.K_m:
-                    mute = not mute
-                    pygame.mixer.music.pause() if mute else pygame.mixer.music.unpause()
-        continue
-
-    handle_input()
-    update_laser()
-    update_obstacles()
-
-    now = time.time()
-    if 15 < now - special_event_timer < 45:
-        spawn_rate = min(spawn_rate + 0.001, 0.12)
-        obstacle_speed = min(obstacle_speed + 0.01, 4)
-
-    if now - special_event_timer > special_event_interval:
-        maddie_display_time = now
-        boost_end_time = now + 10
-        spawn_rate = min(0.1, 0.06)
-        play_special_sound()
-        special_event_timer = now
-        special_event_interval = random.randint(20, 30)
-
-    if now > boost_end_time:
-        spawn_rate = 0.02
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_m:
-            mute = not mute
-            pygame.mixer.music.pause() if mute else pygame.mixer.music.unpause()
 
-    if check_collisions():
+class Playing(Scene):
+    @property
+    def fps(self):
+        return quality.frame_rate(FPS)
+
+    def enter(self):
+        global lag
+        lag = 0.0
+        quality.reset()
+        renderer.invalidate()
+
+    def exit(self):
+        clock.pause(False)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_m:
+            toggle_mute()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            clock.toggle_pause()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle()
+
+    def update(self, dt):
+        # Fixed-timestep update: step the simulation once per elapsed dt
+        global lag, previous
+        if not clock.paused:
+            quality.update(clock.work, clock.real_dt, self.fps)
+        buttons = read_buttons(pygame.key.get_pressed())
+        profiler.lap("input")
+        lag = min(lag + dt, MAX_STEPS_PER_FRAME * sim.dt)
+        while lag >= sim.dt and not sim.crashed:
+            previous = sim.positions()
+            sim.step(buttons)
+            lag -= sim.dt
+        profiler.lap("simulation")
+        if sim.crashed:
+            scenes.switch(game_over)
+
+    def draw(self):
+        draw_game()
+
+class GameOver(Scene):
+    static = True
+    duration = 3
+
+    def enter(self):
         pygame.mixer.music.stop()
-        play_lose_sound()
+        play_sound("lose")
+        if not IS_WEB:
+            try:
+                recorder.replay(sim.tasks_avoided).save(REPLAY_FILE)
+            except OSError as e:
+                print(f"Replay save error: {e}")
+
+    def draw(self):
         screen.fill(BLACK)
         oops_text = "Oops. Responsibility caught up with Andreas."
         text_surface = font.render(oops_text, True, WHITE)
         text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
         screen.blit(text_surface, text_rect)
-        
         pygame.display.update()
-        pygame.time.delay(3000)
-
-        def get_player_initials():
-            name = ""
-            while len(name) < 3:
-                screen.fill(BLACK)
-                draw_text("Enter Your Initials:", 120, SCREEN_HEIGHT // 2 - 40, font, WHITE)
-                draw_text(name, 120, SCREEN_HEIGHT // 2, initial_font, WHITE)
-                pygame.display.update()
-                for event in pygame.event.get():
-                    if event.type == pygame.KEYDOWN:
-                        if event.unicode.upper() in string.ascii_uppercase:
-                            name += event.unicode.upper()
-                        elif event.key == pygame.K_BACKSPACE:
-                            name = name[:-1]
-            return name
-
-        if len(leaderboard) < 5 or tasks_avoided > leaderboard[-1][1]:
-            name = get_player_initials()
-            leaderboard.append((name, tasks_avoided))
+
+    def timeout(self):
+        if len(leaderboard) < 5 or sim.tasks_avoided > leaderboard[-1][1]:
+            scenes.switch(initials)
+        else:
+            scenes.switch(leaderboard_screen)
+
+class Initials(Scene):
+    static = True
+
+    def enter(self):
+        self.name = ""
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.unicode.upper() in string.ascii_uppercase:
+                self.name += event.unicode.upper()
+            elif event.key == pygame.K_BACKSPACE:
+                self.name = self.name[:-1]
+            scenes.redraw()
+        if len(self.name) == 3:
+            leaderboard.append((self.name, sim.tasks_avoided))
             leaderboard.sort(key=lambda x: x[1], reverse=True)
             leaderboard[:] = leaderboard[:5]
             save_leaderboard(leaderboard)
+            scenes.switch(leaderboard_screen)
 
+    def draw(self):
+        screen.fill(BLACK)
+        draw_text("Enter Your Initials:", 120, SCREEN_HEIGHT // 2 - 40, font, WHITE)
+        draw_text(self.name, 120, SCREEN_HEIGHT // 2, initial_font, WHITE)
+        pygame.display.update()
+
+class Leaderboard(Scene):
+    static = True
+    restart_delay = 1
+
+    def enter(self):
+        self.duration = None
+
+    def handle(self, event):
+        if event.type != pygame.KEYDOWN or self.duration is not None:
+            return
+        if event.key == pygame.K_RETURN:
+            # Keep the board up a moment before play resumes
+            reset_game()
+            start_music()
+            self.duration = scenes.elapsed + self.restart_delay
+        elif event.key == pygame.K_ESCAPE:
+            reset_game()
+            start_music()
+            scenes.switch(start)
+
+    def draw(self):
         screen.fill(BLACK)
         draw_text("LEADERBOARD - MOST AVOIDANT LEGENDS", 100, 100, font, WHITE)
         for i, (name, score) in enumerate(leaderboard):
@@ -342,24 +374,23 @@ while running:
         draw_text("Press Enter to Restart. ESC for Menu.", 120, 450, font, WHITE)
         pygame.display.update()
 
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit(); exit()
-                elif event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                    waiting = False
-
-        reset_game()
-        pygame.mixer.music.load(os.path.join(AUDIO_PATH, "happy_whistle_tune.ogg"))
-        pygame.mixer.music.set_volume(0.2)
-        pygame.mixer.music.play(-1)
-        if mute:
-            pygame.mixer.music.pause()
-        pygame.time.delay(1000)
+    def timeout(self):
+        scenes.switch(playing)
 
+start, playing, game_over = Start(), Playing(), GameOver()
+initials, leaderboard_screen = Initials(), Leaderboard()
 
-    draw_game()
-    clock.tick(FPS)
+# --- Game Loop ---
+scenes = SceneMachine(start)
+while running:
+    profiler.begin_frame()
+    events = pygame.event.get()
+    for event in events:
+        if event.type == pygame.QUIT:
+            running = False
+    scenes.frame(events, frame_time)
+    profiler.end_frame()
+    frame_time = clock.tick(scenes.fps)
 
+profiler.save()
 pygame.quit()
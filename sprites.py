@@ -0,0 +1,79 @@
+# Cached sprite variants (darkened, tinted, flipped, scaled...)
+
+from collections import OrderedDict
+
+import pygame
+
+
+def darken(surface, factor=0.5):
+    dark = pygame.Surface(surface.get_size()).convert_alpha()
+    dark.fill((0, 0, 0, int((1 - factor) * 255)))
+    copy = surface.copy()
+    copy.blit(dark, (0, 0))
+    return copy
+
+def tint(surface, color):
+    copy = surface.copy()
+    copy.fill(color, special_flags=pygame.BLEND_RGB_MULT)
+    return copy
+
+def flash(surface, color=(255, 255, 255)):
+    copy = surface.copy()
+    copy.fill(color, special_flags=pygame.BLEND_RGB_ADD)
+    return copy
+
+def fade(surface, alpha):
+    copy = surface.convert_alpha()
+    copy.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return copy
+
+def flip(surface, x=True, y=False):
+    return pygame.transform.flip(surface, x, y)
+
+def scale(surface, size):
+    return pygame.transform.scale(surface, size)
+
+TRANSFORMS = {
+    'darken': darken,
+    'tint': tint,
+    'flash': flash,
+    'fade': fade,
+    'flip': flip,
+    'scale': scale,
+}
+
+
+class SpriteCache:
+    """LRU cache of derived sprites keyed by (source surface, transform, params).
+
+    The source surface itself is part of the key, so a variant is never
+    served for a different surface that happens to reuse the same id.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, surface, transform, *params):
+        key = (surface, transform, params)
+        variant = self.entries.get(key)
+        if variant is None:
+            variant = TRANSFORMS[transform](surface, *params)
+            self.entries[key] = variant
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return variant
+
+    def clear(self):
+        self.entries.clear()
+
+
+sprite_cache = SpriteCache()
+
+def variant(surface, transform, *params):
+    return sprite_cache.get(surface, transform, *params)
+
+def darkened(surface, factor=0.5):
+    return sprite_cache.get(surface, 'darken', factor)
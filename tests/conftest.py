@@ -0,0 +1,6 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The games and the backend are flat scripts, imported by module name
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'web_port')]
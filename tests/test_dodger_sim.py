@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from dodger_sim import ClassicDodgerSim, DodgerSim, FIRE, UP, DOWN, LEFT, RIGHT
+
+
+def scripted(seed):
+    """Buttons from their own RNG, so the run depends only on `seed`."""
+    rng = random.Random(seed)
+    buttons = (0, UP, DOWN, LEFT, RIGHT, FIRE, UP | FIRE, DOWN | FIRE)
+    return lambda sim: rng.choice(buttons)
+
+
+def trace(sim, seed, steps=3000):
+    sim.reset(seed)
+    inputs = scripted(seed)
+    states = []
+    for _ in range(steps):
+        events = sim.step(inputs(sim))
+        states.append((sim.positions(), sim.tasks_avoided, len(sim.obstacles), tuple(events)))
+        if sim.crashed:
+            break
+    return states
+
+
+@pytest.mark.parametrize('rules', [DodgerSim, ClassicDodgerSim])
+def test_same_seed_and_inputs_give_the_same_round(rules):
+    for seed in range(5):
+        assert trace(rules(), seed) == trace(rules(), seed)
+
+
+def test_rounds_differ_between_seeds():
+    assert trace(DodgerSim(), 1) != trace(DodgerSim(), 2)
+
+
+def test_crashed_sim_stops_advancing():
+    sim = DodgerSim(seed=3).run(100000)
+    assert sim.crashed
+    ticks = sim.ticks
+    assert sim.step(FIRE) == []
+    assert sim.ticks == ticks
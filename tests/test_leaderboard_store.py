@@ -0,0 +1,208 @@
+import json
+import os
+import math
+import random
+
+import pytest
+
+from leaderboard_store import LeaderboardStore, ScoreIndex
+from sqlite_store import SqliteLeaderboardStore
+
+
+def entry(name, score):
+    return {'name': name, 'score': score}
+
+
+def names(store):
+    return [e['name'] for e in store.all()]
+
+
+# --- ScoreIndex ---
+def test_index_matches_a_sorted_list():
+    rng = random.Random(5)
+    index, expected = ScoreIndex(load=4), []
+    for i in range(2000):
+        if expected and rng.random() < 0.2:
+            assert index.pop() is expected.pop()
+            continue
+        e = entry(f'{i:03}', rng.randint(0, 50))
+        score = e['score']
+        assert index.rank(score) == sum(x['score'] >= score for x in expected) + 1
+        assert index.below(score) == sum(x['score'] < score for x in expected)
+        expected.append(e)
+        expected.sort(key=lambda x: -x['score'])  # stable: ties keep arrival order
+        assert index.insert(e) == expected.index(e) + 1
+    assert list(index) == expected
+    assert index.top(7) == expected[:7]
+    assert [index.at(i) for i in range(len(index))] == expected
+
+
+def test_index_ranks_ties_in_arrival_order():
+    index = ScoreIndex([entry('AAA', 5), entry('BBB', 9), entry('CCC', 5)])
+    assert [e['name'] for e in index] == ['BBB', 'AAA', 'CCC']
+    assert index.rank(5) == 4
+    assert index.insert(entry('DDD', 5)) == 4
+
+
+# --- LeaderboardStore ---
+def test_store_keeps_the_best_scores(tmp_path):
+    store = LeaderboardStore(str(tmp_path / 'lb.json'), limit=3, fsync=False)
+    results = [store.add(entry(n, s)) for n, s in [('AAA', 1), ('BBB', 5), ('CCC', 3), ('DDD', 4), ('EEE', 0)]]
+    assert results == [(1, 50.0), (1, 75.0), (2, 50.0), (2, 50.0), (None, 0.0)]
+    assert names(store) == ['BBB', 'DDD', 'CCC']
+    assert store.summary() == {
+        'total_scores': 3, 'highest_score': 5, 'lowest_score': 3, 'average_score': 4,
+        'unique_players': 3, 'percentiles': {'p50': 4, 'p90': 5, 'p99': 5},
+    }
+    assert store.percentile(4) == 50.0
+    assert store.best('DDD') == 4 and store.best('EEE') is None
+
+
+def test_store_reloads_from_journal_after_a_crash(tmp_path):
+    path = str(tmp_path / 'lb.json')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+    store.flush()
+    store.add(entry('BBB', 2))
+    # No close(): the second score is only in the journal
+    assert names(LeaderboardStore(path)) == ['BBB', 'AAA']
+
+
+def test_store_drops_a_torn_journal_line_without_losing_later_scores(tmp_path):
+    path = str(tmp_path / 'lb.json')
+    with open(path + '.journal', 'w') as f:
+        f.write('{"name":"a","sc')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+    store.add(entry('BBB', 2))
+    assert names(LeaderboardStore(path)) == ['BBB', 'AAA']
+
+
+def test_store_skips_a_journal_already_in_the_snapshot(tmp_path):
+    path = str(tmp_path / 'lb.json')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+    store.add(entry('BBB', 2))
+    with open(path + '.journal') as f:
+        journal = f.read()
+    store.flush()
+    # A crash after the snapshot was installed, before the journal was emptied
+    with open(path + '.journal', 'w') as f:
+        f.write(journal)
+    reloaded = LeaderboardStore(path)
+    assert names(reloaded) == ['BBB', 'AAA']
+    reloaded.add(entry('CCC', 3))
+    assert names(LeaderboardStore(path)) == ['CCC', 'BBB', 'AAA']
+
+
+def test_store_loads_the_old_list_snapshot(tmp_path):
+    path = tmp_path / 'lb.json'
+    path.write_text(json.dumps([entry('OLD', 5)]))
+    (tmp_path / 'lb.json.journal').write_text(json.dumps(entry('NEW', 6)) + '\n')
+    assert names(LeaderboardStore(str(path))) == ['NEW', 'OLD']
+
+
+# --- SqliteLeaderboardStore ---
+@pytest.mark.parametrize('limit', [None, 20])
+def test_sqlite_store_agrees_with_the_json_store(tmp_path, limit):
+    rng = random.Random(limit)
+    json_store = LeaderboardStore(str(tmp_path / 'lb.json'), limit=limit, fsync=False)
+    sqlite_store = SqliteLeaderboardStore(str(tmp_path / 'lb.db'), limit=limit)
+    for i in range(300):
+        e = entry(rng.choice(['AAA', 'BBB', 'CCC', 'DDD']), rng.randint(0, 40))
+        score = e['score']
+        assert sqlite_store.rank(score) == json_store.rank(score)
+        assert sqlite_store.add(dict(e)) == json_store.add(e)
+        assert sqlite_store.percentile(score) == json_store.percentile(score)
+        assert sqlite_store.standing(score) == json_store.standing(score)
+    assert sqlite_store.top(10) == json_store.top(10)
+    assert sqlite_store.summary() == json_store.summary()
+    assert len(sqlite_store) == len(json_store)
+    assert sqlite_store.best('AAA') == json_store.best('AAA')
+    sqlite_store.close()
+
+
+def test_sqlite_import_runs_once_per_source(tmp_path):
+    store = SqliteLeaderboardStore(str(tmp_path / 'lb.db'))
+    entries = [entry('AAA', 3), entry('BBB', 7)]
+    assert store.import_entries(entries, 'a.json') == 2
+    assert store.import_entries(entries, 'a.json') is None
+    assert [e['name'] for e in store.top()] == ['BBB', 'AAA']
+    assert store.summary()['percentiles'] == {'p50': 3, 'p90': 7, 'p99': 7}
+    assert math.isclose(store.summary()['average_score'], 5)
+    store.close()
+
+
+def test_store_replays_a_journal_renamed_aside_before_the_snapshot(tmp_path):
+    path = str(tmp_path / 'lb.json')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+    store.flush()
+    store.add(entry('BBB', 2))
+    store.journal.close()
+    # A crash after flush() renamed the journal, before the snapshot landed
+    os.replace(path + '.journal', f'{path}.journal.{store.generation}')
+    reloaded = LeaderboardStore(path)
+    assert names(reloaded) == ['BBB', 'AAA']
+    assert not os.path.exists(f'{path}.journal.{store.generation}')
+
+
+def test_store_skips_a_renamed_journal_the_snapshot_covers(tmp_path):
+    path = str(tmp_path / 'lb.json')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+    generation = store.generation
+    with open(path + '.journal') as f:
+        journal = f.read()
+    store.flush()
+    # A crash after the snapshot landed, before the renamed journal was deleted
+    with open(f'{path}.journal.{generation}', 'w') as f:
+        f.write(journal)
+    assert names(LeaderboardStore(path)) == ['AAA']
+
+
+def test_store_serves_while_a_flush_writes(tmp_path, monkeypatch):
+    store = LeaderboardStore(str(tmp_path / 'lb.json'), fsync=False)
+    store.add(entry('AAA', 1))
+    seen = []
+
+    def dumps(obj, **kwargs):
+        if isinstance(obj, dict) and 'scores' in obj and not seen:
+            # Mid-flush, serializing the snapshot: the store must not be locked
+            seen.append(store.add(entry('BBB', 2)))
+        return real_dumps(obj, **kwargs)
+
+    real_dumps = json.dumps
+    monkeypatch.setattr('leaderboard_store.json.dumps', dumps)
+    store.flush()
+    monkeypatch.undo()
+    assert seen == [(1, 75.0)]
+    store.close()
+    assert names(LeaderboardStore(store.path)) == ['BBB', 'AAA']
+
+
+def test_store_tracks_each_players_best_through_evictions(tmp_path):
+    rng = random.Random(9)
+    store = LeaderboardStore(str(tmp_path / 'lb.json'), limit=40, fsync=False)
+    for _ in range(1000):
+        store.add(entry(rng.choice(['AAA', 'BBB', 'CCC', 'DDD', 'EEE']), rng.randint(0, 100)))
+        kept = store.all()
+        for name in ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']:
+            assert store.best(name) == max((e['score'] for e in kept if e['name'] == name), default=None)
+
+
+def test_store_takes_back_a_failed_journal_write(tmp_path, monkeypatch):
+    path = str(tmp_path / 'lb.json')
+    store = LeaderboardStore(path)
+    store.add(entry('AAA', 1))
+
+    def fsync(fd):
+        raise OSError('disk full')
+
+    monkeypatch.setattr('leaderboard_store.os.fsync', fsync)
+    with pytest.raises(OSError):
+        store.add_many([entry('BBB', 2), entry('CCC', 3)])
+    monkeypatch.undo()
+    assert names(store) == ['AAA']
+    store.add(entry('DDD', 4))
+    assert names(LeaderboardStore(path)) == ['DDD', 'AAA']
@@ -0,0 +1,76 @@
+import random
+
+import pygame
+import pytest
+
+from maze import WalkGrid
+
+BLACK, WALL = (0, 0, 0), (40, 0, 90)
+
+
+def random_maze(rng, cols, rows, density):
+    surface = pygame.Surface((cols, rows))
+    surface.fill(BLACK)
+    for y in range(rows):
+        for x in range(cols):
+            if rng.random() < density:
+                surface.set_at((x, y), WALL)
+    return surface
+
+
+def zoomed_cells(surface, zoom):
+    """Per zoomed pixel, True if walkable: the reference the grid must agree with."""
+    cols, rows = surface.get_size()
+    return [[surface.get_at((x // zoom, y // zoom))[:3] == BLACK for x in range(cols * zoom)]
+            for y in range(rows * zoom)]
+
+
+def brute_walkable(cells, x, y, w, h):
+    if w <= 0 or h <= 0:
+        return True
+    if x < 0 or y < 0 or y + h > len(cells) or x + w > len(cells[0]):
+        return False
+    return all(all(row[x:x + w]) for row in cells[y:y + h])
+
+
+def brute_spawn(cells, w, h, reverse):
+    # The scan order of the original find_position()
+    width, height = len(cells[0]), len(cells)
+    xs = range(width - w, 0, -1) if reverse else range(0, width - w)
+    ys = range(height - h, 0, -1) if reverse else range(0, height - h)
+    for y in ys:
+        for x in xs:
+            if brute_walkable(cells, x, y, w, h):
+                return x, y
+    return None
+
+
+@pytest.mark.parametrize('zoom', [1, 2, 3])
+def test_is_walkable_matches_a_pixel_scan(zoom):
+    rng = random.Random(zoom)
+    for _ in range(5):
+        surface = random_maze(rng, rng.randint(3, 12), rng.randint(3, 12), 0.2)
+        grid, cells = WalkGrid(surface, zoom), zoomed_cells(surface, zoom)
+        for _ in range(300):
+            x, y = rng.randint(-3, grid.width), rng.randint(-3, grid.height)
+            w, h = rng.randint(0, 8), rng.randint(0, 8)
+            assert grid.is_walkable(x, y, w, h) == brute_walkable(cells, x, y, w, h), (x, y, w, h)
+
+
+@pytest.mark.parametrize('zoom', [1, 2, 3])
+@pytest.mark.parametrize('reverse', [False, True])
+def test_find_spawn_matches_a_brute_force_scan(zoom, reverse):
+    rng = random.Random(zoom * 10 + reverse)
+    for _ in range(15):
+        cols, rows = rng.randint(2, 11), rng.randint(2, 11)
+        surface = random_maze(rng, cols, rows, rng.choice([0.05, 0.2, 0.4, 0.8]))
+        grid, cells = WalkGrid(surface, zoom), zoomed_cells(surface, zoom)
+        for _ in range(4):
+            w, h = rng.randint(1, cols * zoom), rng.randint(1, rows * zoom)
+            assert grid.find_spawn(w, h, reverse) == brute_spawn(cells, w, h, reverse), (cols, rows, w, h)
+
+
+def test_find_spawn_on_an_all_wall_maze_is_none():
+    surface = pygame.Surface((6, 4))
+    surface.fill(WALL)
+    assert WalkGrid(surface, 2).find_spawn(2, 2) is None
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from dodger_sim import ClassicDodgerSim, DodgerSim, FIRE, UP, DOWN, LEFT, RIGHT
+from replay import Recorder, Replay
+
+
+def scripted(seed):
+    """Buttons from their own RNG, so the run depends only on `seed`."""
+    rng = random.Random(seed)
+    buttons = (0, UP, DOWN, LEFT, RIGHT, FIRE, UP | FIRE, DOWN | FIRE)
+    return lambda sim: rng.choice(buttons)
+
+
+@pytest.mark.parametrize('rules, name', [(DodgerSim, 'dodger'), (ClassicDodgerSim, 'classic')])
+def test_replay_reproduces_the_recorded_round(rules, name):
+    sim = rules()
+    recorder = Recorder(name)
+    sim.listeners.append(recorder)
+    sim.reset(42)
+    sim.run(5000, scripted(42))
+    replay = recorder.replay(sim.tasks_avoided)
+
+    loaded = Replay.from_bytes(replay.to_bytes())
+    assert (loaded.rules, loaded.seed, loaded.buttons, loaded.dt, loaded.score) == \
+        (name, 42, replay.buttons, sim.dt, sim.tasks_avoided)
+    played = loaded.play()
+    assert loaded.verify()
+    assert (played.ticks, played.positions(), played.crashed) == (sim.ticks, sim.positions(), sim.crashed)
+
+
+def test_recorder_restarts_with_each_round():
+    sim = DodgerSim()
+    recorder = Recorder('dodger')
+    sim.listeners.append(recorder)
+    sim.reset(1)
+    sim.run(50, scripted(1))
+    sim.reset(2)
+    sim.run(30, scripted(2))
+    assert recorder.seed == 2
+    assert len(recorder.buttons) == sim.ticks
+
+
+def test_truncated_replay_is_rejected():
+    data = Replay('dodger', 7, bytes(range(200))).to_bytes()
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:-4])
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b'XXXX' + data[4:])
+
+
+def test_unknown_rules_are_rejected():
+    with pytest.raises(ValueError):
+        Replay.from_bytes(Replay('pong', 7, bytes(10)).to_bytes())
+
+
+@pytest.mark.parametrize('dt', [0.0, -1 / 60, float('nan'), float('inf')])
+def test_invalid_step_length_is_rejected(dt):
+    with pytest.raises(ValueError):
+        Replay.from_bytes(Replay('dodger', 7, bytes(10), dt).to_bytes())
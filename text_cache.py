@@ -0,0 +1,72 @@
+# Cached text rendering
+
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU caches of rendered text surfaces and word-wrapped layouts.
+
+    Surfaces are keyed by (font, text, color, antialias). Counters that
+    change often go through draw_glyphs(), which blits one cached surface
+    per character instead of rendering every new value.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.layouts = OrderedDict()
+        self.atlases = {}
+
+    def lookup(self, table, key, make):
+        value = table.get(key)
+        if value is None:
+            value = table[key] = make()
+            if len(table) > self.max_entries:
+                table.popitem(last=False)
+        else:
+            table.move_to_end(key)
+        return value
+
+    def render(self, font, text, color, antialias=True):
+        return self.lookup(self.surfaces, (font, text, color, antialias),
+                           lambda: font.render(text, antialias, color))
+
+    def wrap(self, font, text, max_width):
+        """Split `text` on whitespace into lines no wider than `max_width`."""
+        def layout():
+            lines, current = [], ""
+            for word in text.split():
+                test = f"{current} {word}".strip()
+                if font.size(test)[0] <= max_width:
+                    current = test
+                else:
+                    lines.append(current)
+                    current = word
+            if current:
+                lines.append(current)
+            return tuple(lines)
+        return self.lookup(self.layouts, (font, text, max_width), layout)
+
+    def glyph(self, font, char, color, antialias=True):
+        atlas = self.atlases.setdefault((font, color, antialias), {})
+        surf = atlas.get(char)
+        if surf is None:
+            surf = atlas[char] = font.render(char, antialias, color)
+        return surf
+
+    def draw_glyphs(self, surface, font, text, pos, color, antialias=True):
+        """Blit `text` one cached character at a time; returns the x after the last one."""
+        x, y = pos
+        for char in text:
+            glyph = self.glyph(font, char, color, antialias)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+        return x
+
+    def clear(self):
+        self.surfaces.clear()
+        self.layouts.clear()
+        self.atlases.clear()
+
+
+text_cache = TextCache()
@@ -0,0 +1,306 @@
+"""
+Asyncio (ASGI) server mode for the Special Day Dodger backend
+
+The same endpoints as backend_example.py, for event days when a room full
+of phones submits at once. One process serves thousands of open
+connections from a single event loop:
+
+- Score submissions are queued and committed in batches: whatever arrives
+  within a few milliseconds of the first one goes to the store in one
+  add_many() call (one journal fsync, or one SQLite transaction).
+- GET /api/leaderboard and /api/stats are answered from cached response
+  bodies, rebuilt after a batch lands or once they are a second old.
+- The blocking store calls run in worker threads, so the loop never waits
+  on disk.
+
+Installation:
+    pip install uvicorn
+
+Usage:
+    uvicorn async_backend:app --port 5000
+    (or python async_backend.py)
+
+The store is picked the same way as for backend_example.py; see
+leaderboard_store.open_store().
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from leaderboard_store import open_store
+
+MAX_BODY = 4096
+CACHE_TTL = 1.0
+
+
+class ScoreBatcher:
+    """Coalesces concurrent score submissions into batched commits.
+
+    submit() queues an entry and waits for its result. A single writer
+    task takes the first queued entry, waits `window` seconds for more to
+    arrive, then commits up to `max_batch` of them with one call to
+    store.add_many() in a worker thread, which also returns each entry's
+    percentile as of its own insert. add_many() stores all of a batch or
+    none of it, so a failed batch is retried one entry at a time and one
+    bad entry fails only its own request.
+    `version` counts committed batches, so caches know when to rebuild.
+    close() queues a STOP marker and waits for the writer to reach it.
+    """
+
+    STOP = None
+
+    def __init__(self, store, window=0.005, max_batch=500):
+        self.store = store
+        self.window = window
+        self.max_batch = max_batch
+        self.queue = None
+        self.task = None
+        self.version = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+    async def submit(self, entry):
+        """Commit `entry` with the next batch; returns (rank, percentile)."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((entry, future))
+        return await future
+
+    async def run(self):
+        while True:
+            item = await self.queue.get()
+            if item is self.STOP:
+                return
+            batch = [item]
+            await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is self.STOP:
+                    await self.write(batch)
+                    return
+                batch.append(item)
+            await self.write(batch)
+
+    async def write(self, batch):
+        """Commit `batch` and resolve its futures, falling back to one entry at a time."""
+        try:
+            results = await asyncio.to_thread(self.store.add_many, [entry for entry, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                if not batch[0][1].done():
+                    batch[0][1].set_exception(e)
+                return
+            for item in batch:
+                await self.write([item])
+            return
+        self.version += 1
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        """Commit everything queued so far, then stop the writer."""
+        await self.queue.put(self.STOP)
+        await self.task
+
+
+class ResponseCache:
+    """JSON response bodies kept until the next batch commit or `ttl` seconds.
+
+    The TTL covers stores that other processes write to (a shared SQLite
+    database), whose commits this process's batcher never sees.
+    """
+
+    def __init__(self, batcher, ttl=CACHE_TTL):
+        self.batcher = batcher
+        self.ttl = ttl
+        self.entries = {}
+
+    async def get(self, key, build):
+        """The cached body for `key`, or one built from `build()` in a worker thread."""
+        cached = self.entries.get(key)
+        now = time.monotonic()
+        if cached and cached[0] == self.batcher.version and now - cached[1] < self.ttl:
+            return cached[2]
+        version = self.batcher.version
+        body = json.dumps(await asyncio.to_thread(build)).encode()
+        self.entries[key] = (version, now, body)
+        return body
+
+
+store = open_store()
+batcher = ScoreBatcher(store)
+cache = ResponseCache(batcher)
+
+INDEX = {
+    'name': 'Special Day Dodger API',
+    'version': '1.0',
+    'endpoints': {
+        'GET /api/leaderboard': 'Get top 5 scores',
+        'POST /api/score': 'Submit a new score',
+        'GET /api/rank?score=N': 'Rank a score would get',
+        'GET /api/player/<name>': "A player's best score and its rank"
+    }
+}
+
+
+# --- Requests ---
+def make_entry(data):
+    """(entry, None) for a valid submission, or (None, error message)."""
+    if not data or not isinstance(data, dict):
+        return None, 'No data provided'
+
+    name = str(data.get('name', '')).upper()
+    score = data.get('score', 0)
+
+    # Validate name (3 characters)
+    if not name or len(name) != 3:
+        return None, 'Name must be 3 characters'
+
+    # Validate score
+    if not isinstance(score, int) or isinstance(score, bool) or score < 0:
+        return None, 'Invalid score'
+
+    # Validate timestamp (milliseconds; ours if the client sent none), so
+    # nothing unstorable reaches a batch
+    timestamp = data.get('timestamp')
+    if timestamp is None:
+        timestamp = int(datetime.now().timestamp() * 1000)
+    elif isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)) or not 0 <= timestamp < 2 ** 53:
+        return None, 'Invalid timestamp'
+
+    return {
+        'name': name,
+        'score': score,
+        'timestamp': int(timestamp),
+        'submitted_at': datetime.now().isoformat()
+    }, None
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY:
+            return None
+        if not message.get('more_body'):
+            return body
+
+
+async def respond(send, status, body):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            # Same as flask_cors' defaults in backend_example.py
+            (b'access-control-allow-origin', b'*'),
+            (b'access-control-allow-headers', b'content-type'),
+            (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def submit_score(receive):
+    body = await read_body(receive)
+    if body is None:
+        return 413, {'success': False, 'message': 'Request too large'}
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return 400, {'success': False, 'message': 'Invalid JSON'}
+    entry, error = make_entry(data)
+    if error:
+        return 400, {'success': False, 'message': error}
+    try:
+        rank, percentile = await batcher.submit(entry)
+    except Exception as e:
+        return 500, {'success': False, 'message': str(e)}
+    return 200, {
+        'success': True,
+        'message': 'Score submitted successfully',
+        'rank': rank,
+        'top_5': rank is not None and rank <= 5,
+        'percentile': percentile
+    }
+
+
+def query_int(scope, name):
+    values = parse_qs(scope.get('query_string', b'').decode()).get(name)
+    try:
+        return int(values[0]) if values else None
+    except ValueError:
+        return None
+
+
+async def route(scope, receive):
+    """(status, body) for one request; body is bytes or something to JSON-encode."""
+    method, path = scope['method'], scope['path'].rstrip('/') or '/'
+    if method == 'OPTIONS':
+        return 204, b''
+    if path == '/' and method == 'GET':
+        return 200, INDEX
+    if path == '/api/leaderboard' and method == 'GET':
+        return 200, await cache.get('top', lambda: store.top(5))
+    if path == '/api/score' and method == 'POST':
+        return await submit_score(receive)
+    if path == '/api/stats' and method == 'GET':
+        score = query_int(scope, 'score')
+        if score is None:
+            return 200, await cache.get('stats', store.summary)
+        stats = await asyncio.to_thread(store.summary)
+        stats['percentile'] = await asyncio.to_thread(store.percentile, score)
+        return 200, stats
+    if path == '/api/rank' and method == 'GET':
+        score = query_int(scope, 'score')
+        if score is None or score < 0:
+            return 400, {'success': False, 'message': 'Invalid score'}
+        rank, total = await asyncio.to_thread(lambda: (store.rank(score), len(store)))
+        return 200, {'score': score, 'rank': rank, 'total_scores': total}
+    if path.startswith('/api/player/') and method == 'GET':
+        name = path[len('/api/player/'):].upper()
+        best = await asyncio.to_thread(store.best, name)
+        if best is None:
+            return 404, {'success': False, 'message': 'No scores for that name'}
+        return 200, {'name': name, 'best': best, 'rank': await asyncio.to_thread(store.standing, best)}
+    return 404, {'success': False, 'message': 'Not found'}
+
+
+# --- ASGI entry point ---
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            batcher.start()
+            store.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await batcher.close()
+            await asyncio.to_thread(store.close)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+    status, body = await route(scope, receive)
+    await respond(send, status, body)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("Special Day Dodger - async backend on http://localhost:5000")
+    uvicorn.run(app, host='0.0.0.0', port=5000, backlog=4096)
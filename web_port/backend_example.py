@@ -14,27 +14,19 @@ Then update js/config.js to set:
 
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import json
-import os
+import atexit
 from datetime import datetime
 
+from leaderboard_store import open_store
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# In-memory leaderboard (replace with database in production)
-LEADERBOARD_FILE = 'leaderboard.json'
-
-def load_leaderboard():
-    """Load leaderboard from file"""
-    if os.path.exists(LEADERBOARD_FILE):
-        with open(LEADERBOARD_FILE, 'r') as f:
-            return json.load(f)
-    return []
-
-def save_leaderboard(data):
-    """Save leaderboard to file"""
-    with open(LEADERBOARD_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+# leaderboard.json served from memory and written behind by default, or
+# SQLite with LEADERBOARD_STORE=sqlite; see leaderboard_store.open_store()
+store = open_store()
+store.start()
+atexit.register(store.close)
 
 @app.route('/')
 def index():
@@ -44,17 +36,16 @@ def index():
         'version': '1.0',
         'endpoints': {
             'GET /api/leaderboard': 'Get top 5 scores',
-            'POST /api/score': 'Submit a new score'
+            'POST /api/score': 'Submit a new score',
+            'GET /api/rank?score=N': 'Rank a score would get',
+            'GET /api/player/<name>': "A player's best score and its rank"
         }
     })
 
 @app.route('/api/leaderboard', methods=['GET'])
 def get_leaderboard():
     """Get the top 5 scores"""
-    leaderboard = load_leaderboard()
-    # Sort by score descending and return top 5
-    sorted_board = sorted(leaderboard, key=lambda x: x['score'], reverse=True)[:5]
-    return jsonify(sorted_board)
+    return jsonify(store.top(5))
 
 @app.route('/api/score', methods=['POST'])
 def submit_score():
@@ -77,9 +68,6 @@ def submit_score():
         if not isinstance(score, int) or score < 0:
             return jsonify({'success': False, 'message': 'Invalid score'}), 400
 
-        # Load current leaderboard
-        leaderboard = load_leaderboard()
-
         # Add new score
         new_entry = {
             'name': name,
@@ -88,48 +76,46 @@ def submit_score():
             'submitted_at': datetime.now().isoformat()
         }
 
-        leaderboard.append(new_entry)
-
-        # Sort and keep top 100 (or whatever limit you want)
-        leaderboard = sorted(leaderboard, key=lambda x: x['score'], reverse=True)[:100]
-
-        # Save to file
-        save_leaderboard(leaderboard)
-
-        # Check if score made it to top 5
-        top_5 = leaderboard[:5]
-        made_top_5 = new_entry in top_5
+        # Journaled now, written to the file within a couple of seconds;
+        # scores outside the retention limit get no rank
+        rank, percentile = store.add(new_entry)
 
         return jsonify({
             'success': True,
             'message': 'Score submitted successfully',
-            'rank': leaderboard.index(new_entry) + 1,
-            'top_5': made_top_5
+            'rank': rank,
+            'top_5': rank is not None and rank <= 5,
+            'percentile': percentile
         })
 
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
+@app.route('/api/rank', methods=['GET'])
+def get_rank():
+    """Get the rank a score would get if submitted now"""
+    score = request.args.get('score', type=int)
+    if score is None or score < 0:
+        return jsonify({'success': False, 'message': 'Invalid score'}), 400
+    return jsonify({'score': score, 'rank': store.rank(score), 'total_scores': len(store)})
+
+@app.route('/api/player/<name>', methods=['GET'])
+def get_player(name):
+    """Get a player's best score and the rank it holds"""
+    name = name.upper()
+    best = store.best(name)
+    if best is None:
+        return jsonify({'success': False, 'message': 'No scores for that name'}), 404
+    return jsonify({'name': name, 'best': best, 'rank': store.standing(best)})
+
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
-    """Get leaderboard statistics"""
-    leaderboard = load_leaderboard()
-
-    if not leaderboard:
-        return jsonify({
-            'total_scores': 0,
-            'highest_score': 0,
-            'average_score': 0
-        })
-
-    scores = [entry['score'] for entry in leaderboard]
-
-    return jsonify({
-        'total_scores': len(leaderboard),
-        'highest_score': max(scores),
-        'average_score': sum(scores) / len(scores),
-        'unique_players': len(set(entry['name'] for entry in leaderboard))
-    })
+    """Get leaderboard statistics, kept up to date as scores come in"""
+    stats = store.summary()
+    score = request.args.get('score', type=int)
+    if score is not None:
+        stats['percentile'] = store.percentile(score)
+    return jsonify(stats)
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -140,9 +126,13 @@ if __name__ == '__main__':
     print("  GET  / - API information")
     print("  GET  /api/leaderboard - Top 5 scores")
     print("  POST /api/score - Submit new score")
+    print("  GET  /api/rank?score=N - Rank a score would get")
+    print("  GET  /api/player/<name> - A player's best score")
     print("  GET  /api/stats - Leaderboard statistics")
     print("\nDon't forget to update js/config.js with:")
     print("  API_BASE_URL: 'http://localhost:5000/api'")
     print("\n" + "=" * 60 + "\n")
 
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # No reloader: it would import this module twice, giving two stores
+    # flushing the same file
+    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
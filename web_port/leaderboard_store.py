@@ -0,0 +1,482 @@
+"""
+Leaderboard storage for the Special Day Dodger backend
+
+Scores are loaded from disk once and served from memory. New scores are
+appended to a journal file as they arrive (one JSON object per line) and
+the full leaderboard is written behind, every few seconds, by replacing
+the JSON file atomically. A crash loses nothing that reached the journal:
+the next load replays it on top of the last snapshot. Each journal starts
+with its generation number and each snapshot records the last generation
+it includes. A flush renames the journal aside (`.journal.<generation>`)
+and starts the next one, then writes the snapshot without holding up
+reads or submits; renamed journals are deleted once a snapshot covers
+them, and any left over by a crash are replayed, or skipped if the
+snapshot already has them.
+
+One store per file: run a single server process against a leaderboard
+file, or give each process its own.
+"""
+
+import json
+import math
+import os
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+PERCENTILES = (50, 90, 99)
+
+
+class ScoreIndex:
+    """Entries ordered best first by score, ties in arrival order.
+
+    The entries live in a list of sorted buckets of about `load` each (the
+    layout of sortedcontainers' SortedList), with the last key of every
+    bucket in `maxes` and a Fenwick tree over bucket sizes. insert(), pop()
+    and rank() cost O(log n) plus shifting within one bucket; top(k) is
+    O(k). A key is (-score, arrival number), so earlier scores win ties.
+    """
+
+    def __init__(self, entries=(), load=500):
+        self.load = load
+        self.load_sorted(entries)
+
+    def load_sorted(self, entries):
+        """Replace the contents with `entries`, ranked by a stable sort."""
+        entries = sorted(entries, key=lambda x: x['score'], reverse=True)
+        self.seq = len(entries)
+        keys = [(-entry['score'], i) for i, entry in enumerate(entries)]
+        n = self.load
+        self.keys = [keys[i:i + n] for i in range(0, len(keys), n)]
+        self.items = [entries[i:i + n] for i in range(0, len(entries), n)]
+        self.maxes = [bucket[-1] for bucket in self.keys]
+        self.size = len(entries)
+        self.build_tree()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for bucket in self.items:
+            yield from bucket
+
+    # --- Fenwick tree of bucket sizes ---
+    def build_tree(self):
+        tree = [len(bucket) for bucket in self.keys]
+        for i in range(len(tree)):
+            j = i | (i + 1)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self.tree = tree
+
+    def tree_add(self, i, delta):
+        tree = self.tree
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def before(self, b):
+        """Number of entries in the buckets before bucket `b`."""
+        total, tree = 0, self.tree
+        while b > 0:
+            total += tree[b - 1]
+            b &= b - 1
+        return total
+
+    # --- Queries ---
+    def top(self, k):
+        result = []
+        for bucket in self.items:
+            if len(result) >= k:
+                break
+            result.extend(bucket[:k - len(result)])
+        return result
+
+    def position(self, key):
+        """Number of entries whose key sorts before `key`."""
+        b = bisect_left(self.maxes, key)
+        if b == len(self.maxes):
+            return self.size
+        return self.before(b) + bisect_left(self.keys[b], key)
+
+    def rank(self, score):
+        """1-based rank a new `score` would get, after every entry it ties with, as insert() places it."""
+        return self.position((-score, math.inf)) + 1
+
+    def above(self, score):
+        """Number of entries scoring more than `score`."""
+        return self.position((-score, -1))
+
+    def below(self, score):
+        """Number of entries scoring less than `score`."""
+        return self.size - self.position((-score, math.inf))
+
+    def at(self, i):
+        """The entry ranked `i` (0-based), found by descending the Fenwick tree."""
+        tree, b, step = self.tree, 0, 1 << len(self.tree).bit_length()
+        while step:
+            if b + step <= len(tree) and tree[b + step - 1] <= i:
+                b += step
+                i -= tree[b - 1]
+            step >>= 1
+        return self.items[b][i]
+
+    # --- Updates ---
+    def insert(self, entry):
+        """Add `entry`; returns its 1-based rank."""
+        key = (-entry['score'], self.seq)
+        self.seq += 1
+        self.size += 1
+        if not self.keys:
+            self.keys, self.items, self.maxes = [[key]], [[entry]], [key]
+            self.build_tree()
+            return 1
+        # New keys sort after every equal score, so they go in the first
+        # bucket whose last key is bigger, or at the very end
+        b = min(bisect_left(self.maxes, key), len(self.maxes) - 1)
+        keys, items = self.keys[b], self.items[b]
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        items.insert(i, entry)
+        self.maxes[b] = keys[-1]
+        rank = self.before(b) + i + 1
+        if len(keys) > 2 * self.load:
+            half = len(keys) // 2
+            self.keys[b:b + 1] = [keys[:half], keys[half:]]
+            self.items[b:b + 1] = [items[:half], items[half:]]
+            self.maxes[b:b + 1] = [keys[half - 1], keys[-1]]
+            self.build_tree()
+        else:
+            self.tree_add(b, 1)
+        return rank
+
+    def pop(self):
+        """Remove and return the lowest-ranked entry."""
+        keys, items = self.keys[-1], self.items[-1]
+        keys.pop()
+        entry = items.pop()
+        self.size -= 1
+        if keys:
+            self.maxes[-1] = keys[-1]
+            self.tree_add(len(self.keys) - 1, -1)
+        else:
+            del self.keys[-1], self.items[-1], self.maxes[-1]
+            self.build_tree()
+        return entry
+
+
+class ScoreStats:
+    """Running aggregates over the entries of a ScoreIndex, updated per entry in O(1).
+
+    Keeps the count, sum, unique players with their best scores and an
+    exact histogram of scores. remove() expects the entry to be out of the
+    index already. Evicting the lowest-ranked entry leaves a player's best
+    as it was, since their other entries all score at least as much; only
+    removing a best from higher up rescans the index for the next one.
+    The highest and lowest scores and the percentiles are read from the
+    index by position in O(log n), so no read or write ever walks the
+    scores. rebuild() starts over from the index's current entries.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.rebuild()
+
+    def rebuild(self):
+        self.count = 0
+        self.total = 0
+        self.names = Counter()
+        self.bests = {}
+        self.histogram = Counter()
+        for entry in self.index:
+            self.add(entry)
+
+    def add(self, entry):
+        self.count += 1
+        self.total += entry['score']
+        self.names[entry['name']] += 1
+        if entry['score'] > self.bests.get(entry['name'], -math.inf):
+            self.bests[entry['name']] = entry['score']
+        self.histogram[entry['score']] += 1
+
+    def remove(self, entry):
+        score, name = entry['score'], entry['name']
+        self.count -= 1
+        self.total -= score
+        for counter, key in ((self.names, name), (self.histogram, score)):
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
+        if name not in self.names:
+            del self.bests[name]
+        elif score == self.bests[name] and score > self.index.at(len(self.index) - 1)['score']:
+            # Their best left from above the bottom of the board
+            self.bests[name] = max(e['score'] for e in self.index if e['name'] == name)
+
+    def percentiles(self):
+        """{'p50': ..., ...} by nearest rank: the ceil(p% of n)-th lowest score."""
+        n = len(self.index)
+        return {f'p{p}': self.index.at(n - math.ceil(p / 100 * n))['score'] for p in PERCENTILES} if n else {}
+
+    def summary(self):
+        n = len(self.index)
+        return {
+            'total_scores': self.count,
+            'highest_score': self.index.at(0)['score'] if n else 0,
+            'lowest_score': self.index.at(n - 1)['score'] if n else 0,
+            'average_score': self.total / self.count if self.count else 0,
+            'unique_players': len(self.names),
+            'percentiles': self.percentiles(),
+        }
+
+
+def rotated_journals(journal_path):
+    """[(generation, path)] of the journals a flush renamed aside, oldest first."""
+    folder, prefix = os.path.split(journal_path)
+    prefix += '.'
+    found = []
+    for name in os.listdir(folder or '.'):
+        if name.startswith(prefix) and name[len(prefix):].isdigit():
+            found.append((int(name[len(prefix):]), os.path.join(folder, name)))
+    return sorted(found)
+
+
+def read_journal(path):
+    """(entries, torn): the lines of a journal up to any torn one, and whether there was one."""
+    entries = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-write
+                    return entries, True
+    return entries, False
+
+
+class LeaderboardStore:
+    """In-memory leaderboard with a journal and write-behind snapshots.
+
+    `path` is the JSON snapshot, {"journal": generation, "scores": [...]}
+    (a bare list of entries, the old format, still loads); the journal
+    lives next to it at `path + '.journal'`. Entries are dicts with at
+    least 'name' and 'score', ranked in a ScoreIndex. `limit` is the
+    retention policy: only the best `limit` entries are kept, or all of
+    them if it is None; `stats` aggregates the kept ones. Call start() to flush every `flush_interval`
+    seconds from a background thread and close() on shutdown.
+    """
+
+    def __init__(self, path, limit=100, flush_interval=2.0, fsync=True):
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.limit = limit
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.index = ScoreIndex()
+        self.stats = ScoreStats(self.index)
+        self.dirty = False
+        self.journal = None
+        self.generation = 0
+        self.stopping = threading.Event()
+        self.thread = None
+        self.load()
+
+    # --- Loading ---
+    def load(self):
+        """Read the snapshot and replay the journal over it."""
+        with self.lock:
+            entries, applied = [], -1
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    snapshot = json.load(f)
+                if isinstance(snapshot, dict):
+                    entries, applied = snapshot['scores'], snapshot['journal']
+                else:
+                    entries = snapshot
+            self.generation = applied + 1
+            journals = [path for _, path in rotated_journals(self.journal_path)] + [self.journal_path]
+            self.dirty = False
+            for path in journals:
+                replayed, torn = read_journal(path)
+                # Anything in a journal is flushed into a new snapshot and
+                # the journal emptied: a torn line has to go, or later
+                # appends would join onto it, and so do lines already in
+                # the snapshot
+                self.dirty = self.dirty or bool(replayed) or torn
+                if replayed and 'journal' in replayed[0]:
+                    generation = replayed.pop(0)['journal']
+                    if generation <= applied:
+                        # Flushed into the snapshot already, then a crash
+                        # stopped the journal from being deleted
+                        replayed = []
+                    self.generation = max(self.generation, generation)
+                entries.extend(replayed)
+            self.index.load_sorted(entries)
+            while self.limit is not None and len(self.index) > self.limit:
+                self.index.pop()
+                self.dirty = True
+            self.stats.rebuild()
+        if self.dirty:
+            self.flush()
+
+    # --- Reads ---
+    def __len__(self):
+        return len(self.index)
+
+    def top(self, n=5):
+        with self.lock:
+            return self.index.top(n)
+
+    def rank(self, score):
+        """The rank a new `score` would get."""
+        with self.lock:
+            return self.index.rank(score)
+
+    def standing(self, score):
+        """The rank held by a kept `score`: one more than the scores above it."""
+        with self.lock:
+            return self.index.above(score) + 1
+
+    def percentile(self, score):
+        """Percentile rank of `score` among the kept scores: those below it, plus half its ties."""
+        with self.lock:
+            return self._percentile(score)
+
+    def _percentile(self, score):
+        if not self.stats.count:
+            return None
+        below = self.index.below(score)
+        return round(100 * (below + self.stats.histogram[score] / 2) / self.stats.count, 1)
+
+    def summary(self):
+        with self.lock:
+            return self.stats.summary()
+
+    def best(self, name):
+        """A player's best score, or None."""
+        with self.lock:
+            return self.stats.bests.get(name)
+
+    def all(self):
+        with self.lock:
+            return list(self.index)
+
+    # --- Writes ---
+    def add(self, entry):
+        """Journal and insert `entry`; returns (rank, percentile) right after the insert.
+
+        The rank is 1-based, or None if the entry didn't make the cut.
+        """
+        return self.add_many([entry])[0]
+
+    def add_many(self, entries):
+        """add() for several entries with one journal write and one fsync; returns their results.
+
+        All or nothing: if the journal write fails, it is cut back to where
+        it was and nothing is inserted, so the entries can be retried.
+        """
+        lines = ''.join(json.dumps(entry, separators=(',', ':')) + '\n' for entry in entries)
+        with self.lock:
+            if self.journal is None:
+                # Unbuffered, so a failed write leaves nothing behind to flush later
+                self.journal = open(self.journal_path, 'ab', buffering=0)
+                if not self.journal.tell():
+                    lines = json.dumps({'journal': self.generation}) + '\n' + lines
+            data, end = lines.encode(), self.journal.tell()
+            try:
+                if self.journal.write(data) != len(data):
+                    raise OSError(f"short write to {self.journal_path}")
+                if self.fsync:
+                    os.fsync(self.journal.fileno())
+            except OSError:
+                os.ftruncate(self.journal.fileno(), end)
+                raise
+            self.dirty = True
+            return [self._insert(entry) for entry in entries]
+
+    def _insert(self, entry):
+        rank = self.index.insert(entry)
+        self.stats.add(entry)
+        if self.limit is not None and len(self.index) > self.limit:
+            self.stats.remove(self.index.pop())
+            if rank > self.limit:
+                rank = None
+        return rank, self._percentile(entry['score'])
+
+    def flush(self):
+        """Write the leaderboard to disk if it changed, then delete the journals it covers.
+
+        Only copying the entries and renaming the journal aside hold the
+        store lock; serializing and writing the snapshot happen outside it.
+        """
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty:
+                    return False
+                entries, generation = list(self.index), self.generation
+                if self.journal is not None:
+                    self.journal.close()
+                    self.journal = None
+                if os.path.exists(self.journal_path):
+                    os.replace(self.journal_path, f'{self.journal_path}.{generation}')
+                self.generation += 1
+                self.dirty = False
+            try:
+                data = json.dumps({'journal': generation, 'scores': entries}, separators=(',', ':'))
+                tmp = self.path + '.tmp'
+                with open(tmp, 'w') as f:
+                    f.write(data)
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                # The renamed journal stays until a later flush succeeds
+                with self.lock:
+                    self.dirty = True
+                raise
+            # Everything journaled up to `generation` is in the snapshot now
+            for rotated, path in rotated_journals(self.journal_path):
+                if rotated <= generation:
+                    os.remove(path)
+            return True
+
+    # --- Write-behind thread ---
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='leaderboard-flush', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Leaderboard flush error: {e}")
+
+    def close(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+
+def open_store():
+    """The store the backends are configured for by environment variables.
+
+    LEADERBOARD_STORE is 'json' (leaderboard.json, the default) or 'sqlite'
+    (LEADERBOARD_DB, leaderboard.db by default). LEADERBOARD_LIMIT is the
+    retention policy, a number of scores or 'all'; the JSON store keeps 100
+    by default and SQLite everything.
+    """
+    kind = os.environ.get('LEADERBOARD_STORE', 'json')
+    limit = os.environ.get('LEADERBOARD_LIMIT', '100' if kind == 'json' else 'all')
+    limit = None if limit == 'all' else int(limit)
+    if kind == 'sqlite':
+        from sqlite_store import SqliteLeaderboardStore
+        return SqliteLeaderboardStore(os.environ.get('LEADERBOARD_DB', 'leaderboard.db'), game='dodger', limit=limit)
+    return LeaderboardStore('leaderboard.json', limit=limit, flush_interval=2.0)
@@ -0,0 +1,81 @@
+"""
+Import the JSON leaderboards into the SQLite leaderboard database
+
+Usage:
+    python migrate_leaderboard.py [--db leaderboard.db] [FILE[:GAME] ...]
+
+With no files, imports the pygame games' boards from the repository root:
+leaderboard.json as 'dodger' and leaderboard_2.json as 'maddiepaddy'.
+Both the pygame format ([["ABC", 12], ...]) and the backend's format
+({"journal": 3, "scores": [{"name": "ABC", "score": 12, ...}, ...]}, or
+a bare list of those) are accepted. Each file is
+imported once; running the tool again skips files already imported.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from sqlite_store import SqliteLeaderboardStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SOURCES = [
+    (os.path.join(ROOT, 'leaderboard.json'), 'dodger'),
+    (os.path.join(ROOT, 'leaderboard_2.json'), 'maddiepaddy'),
+]
+
+
+def read_entries(path):
+    """Entries of a leaderboard file as dicts with at least 'name' and 'score'."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data['scores']
+    entries = []
+    for item in data:
+        if isinstance(item, dict):
+            entries.append(item)
+        else:
+            name, score = item[:2]
+            entries.append({'name': name, 'score': score})
+    return entries
+
+
+def parse_source(arg):
+    path, _, game = arg.rpartition(':')
+    if not path or os.sep in game:
+        return arg, 'dodger'
+    return path, game
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import JSON leaderboards into SQLite.")
+    parser.add_argument('sources', nargs='*', metavar='FILE[:GAME]')
+    parser.add_argument('--db', default='leaderboard.db')
+    args = parser.parse_args(argv)
+
+    sources = [parse_source(arg) for arg in args.sources] or DEFAULT_SOURCES
+    status = 0
+    for path, game in sources:
+        if not os.path.exists(path):
+            print(f"{path}: not found, skipped")
+            continue
+        try:
+            entries = read_entries(path)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"{path}: unreadable ({e})")
+            status = 1
+            continue
+        store = SqliteLeaderboardStore(args.db, game=game)
+        added = store.import_entries(entries, os.path.abspath(path))
+        store.close()
+        if added is None:
+            print(f"{path}: already imported, skipped")
+        else:
+            print(f"{path}: {added} scores imported into '{game}'")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
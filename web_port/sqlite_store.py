@@ -0,0 +1,303 @@
+"""
+SQLite storage for the Special Day Dodger backend
+
+A drop-in alternative to LeaderboardStore for boards that keep their whole
+history. Every score is a row; triggers keep a per-game score histogram,
+per-player counts and running totals up to date inside the same
+transaction, so top-N, rank, player-best and stats queries touch an index
+or a few summary rows rather than the full table. The database runs in
+WAL mode, so readers never wait for the writer, and each submit is one
+BEGIN IMMEDIATE transaction: concurrent submitters queue on the write lock
+instead of overwriting each other.
+
+Run migrate_leaderboard.py to import the existing JSON leaderboards.
+"""
+
+import math
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+PERCENTILES = (50, 90, 99)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    timestamp INTEGER,
+    submitted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_game_score ON scores (game, score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_name ON scores (name, game, score DESC);
+
+CREATE TABLE IF NOT EXISTS score_counts (
+    game TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (game, score)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS player_counts (
+    game TEXT NOT NULL,
+    name TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (game, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS game_totals (
+    game TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    players INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    game TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS scores_insert AFTER INSERT ON scores BEGIN
+    INSERT OR IGNORE INTO game_totals (game) VALUES (new.game);
+    UPDATE game_totals SET
+        count = count + 1,
+        total = total + new.score,
+        players = players + NOT EXISTS (SELECT 1 FROM player_counts WHERE game = new.game AND name = new.name),
+        version = version + 1
+    WHERE game = new.game;
+    INSERT INTO score_counts VALUES (new.game, new.score, 1)
+        ON CONFLICT (game, score) DO UPDATE SET n = n + 1;
+    INSERT INTO player_counts VALUES (new.game, new.name, 1)
+        ON CONFLICT (game, name) DO UPDATE SET n = n + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS scores_delete AFTER DELETE ON scores BEGIN
+    UPDATE score_counts SET n = n - 1 WHERE game = old.game AND score = old.score;
+    DELETE FROM score_counts WHERE game = old.game AND score = old.score AND n = 0;
+    UPDATE player_counts SET n = n - 1 WHERE game = old.game AND name = old.name;
+    DELETE FROM player_counts WHERE game = old.game AND name = old.name AND n = 0;
+    UPDATE game_totals SET
+        count = count - 1,
+        total = total - old.score,
+        players = players - NOT EXISTS (SELECT 1 FROM player_counts WHERE game = old.game AND name = old.name),
+        version = version + 1
+    WHERE game = old.game;
+END;
+"""
+
+# sqlite3 keeps each connection's compiled statements in a cache keyed by
+# the SQL text, so these are prepared once per pooled connection
+INSERT_SCORE = "INSERT INTO scores (game, name, score, timestamp, submitted_at) VALUES (?, ?, ?, ?, ?)"
+TOP = ("SELECT name, score, timestamp, submitted_at FROM scores WHERE game = ? "
+       "ORDER BY score DESC, id LIMIT ?")
+ABOVE = "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE game = ? AND score > ?"
+BELOW = "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE game = ? AND score < ?"
+TIES = "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE game = ? AND score = ?"
+TOTALS = "SELECT count, total, players, version FROM game_totals WHERE game = ?"
+HISTOGRAM = "SELECT score, n FROM score_counts WHERE game = ? ORDER BY score"
+PLAYER_BEST = "SELECT MAX(score) FROM scores WHERE name = ? AND game = ?"
+TRIM = ("DELETE FROM scores WHERE id IN (SELECT id FROM scores WHERE game = ? "
+        "ORDER BY score, id DESC LIMIT ?)")
+
+
+class ConnectionPool:
+    """Up to `size` connections to one database, shared by request threads.
+
+    connection() hands out an idle connection, opening a new one while
+    fewer than `size` exist, and otherwise waits for one to come back.
+    Connections run in autocommit mode; callers open their own
+    transactions.
+    """
+
+    def __init__(self, path, size=4, timeout=5.0):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+        self.lock = threading.Lock()
+
+    def open(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                grow = self.opened < self.size
+                if grow:
+                    self.opened += 1
+            conn = self.open() if grow else self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SqliteLeaderboardStore:
+    """Leaderboard for one `game` in a shared SQLite database.
+
+    Offers the same calls as LeaderboardStore. `limit` is
+    the retention policy as before, but defaults to keeping every score.
+    Ties rank in arrival order. Percentiles are cached per process and
+    recomputed only when the game's version counter has moved.
+    """
+
+    def __init__(self, path, game='dodger', limit=None, pool_size=4):
+        self.path = path
+        self.game = game
+        self.limit = limit
+        self.pool = ConnectionPool(path, pool_size)
+        self.cache = (None, None)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        with self.pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # --- Writes ---
+    def add(self, entry):
+        """Insert `entry`; returns (rank, percentile) right after the insert.
+
+        The rank is 1-based, or None if the entry didn't make the cut.
+        """
+        return self.add_many([entry])[0]
+
+    def add_many(self, entries):
+        """add() for several entries in one transaction; returns their results."""
+        with self.transaction() as conn:
+            return [self._insert(conn, entry) for entry in entries]
+
+    def _insert(self, conn, entry):
+        game, score = self.game, entry['score']
+        conn.execute(INSERT_SCORE, (game, entry['name'], score, entry.get('timestamp'), entry.get('submitted_at')))
+        # Later arrivals rank after earlier ties, so this one is the last of its score
+        rank = conn.execute(ABOVE, (game, score)).fetchone()[0] + conn.execute(TIES, (game, score)).fetchone()[0]
+        if self.limit is not None:
+            count = conn.execute(TOTALS, (game,)).fetchone()[0]
+            if count > self.limit:
+                conn.execute(TRIM, (game, count - self.limit))
+                if rank > self.limit:
+                    rank = None
+        return rank, self._percentile(conn, score)
+
+    def import_entries(self, entries, source):
+        """Bulk insert `entries` in one transaction, once per `source`.
+
+        Returns the number of rows added, or None if `source` was imported before.
+        """
+        rows = [(self.game, e['name'], e['score'], e.get('timestamp'), e.get('submitted_at')) for e in entries]
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM imports WHERE source = ?", (source,)).fetchone():
+                return None
+            conn.executemany(INSERT_SCORE, rows)
+            conn.execute("INSERT INTO imports VALUES (?, ?, ?, ?)",
+                         (source, self.game, len(rows), datetime.now().isoformat()))
+        return len(rows)
+
+    # --- Reads ---
+    def top(self, n=5):
+        with self.pool.connection() as conn:
+            rows = conn.execute(TOP, (self.game, n)).fetchall()
+        # Imported pygame scores have no timestamps
+        return [{key: value for key, value in zip(('name', 'score', 'timestamp', 'submitted_at'), row) if value is not None}
+                for row in rows]
+
+    def rank(self, score):
+        """The rank a new `score` would get, after the scores it ties with."""
+        with self.pool.connection() as conn:
+            above = conn.execute(ABOVE, (self.game, score)).fetchone()[0]
+            ties = conn.execute(TIES, (self.game, score)).fetchone()[0]
+        return above + ties + 1
+
+    def standing(self, score):
+        """The rank held by a kept `score`: one more than the scores above it."""
+        with self.pool.connection() as conn:
+            return conn.execute(ABOVE, (self.game, score)).fetchone()[0] + 1
+
+    def best(self, name):
+        """A player's best score, or None."""
+        with self.pool.connection() as conn:
+            return conn.execute(PLAYER_BEST, (name, self.game)).fetchone()[0]
+
+    def __len__(self):
+        with self.pool.connection() as conn:
+            row = conn.execute(TOTALS, (self.game,)).fetchone()
+        return row[0] if row else 0
+
+    def percentile(self, score):
+        """Percentile rank of `score` among the kept scores: those below it, plus half its ties."""
+        with self.pool.connection() as conn:
+            return self._percentile(conn, score)
+
+    def _percentile(self, conn, score):
+        row = conn.execute(TOTALS, (self.game,)).fetchone()
+        if not row or not row[0]:
+            return None
+        below = conn.execute(BELOW, (self.game, score)).fetchone()[0]
+        ties = conn.execute(TIES, (self.game, score)).fetchone()[0]
+        return round(100 * (below + ties / 2) / row[0], 1)
+
+    def summary(self):
+        with self.pool.connection() as conn:
+            row = conn.execute(TOTALS, (self.game,)).fetchone()
+            count, total, players, version = row or (0, 0, 0, 0)
+            version_cached, distribution = self.cache
+            if version_cached != version:
+                distribution = self.distribution(conn, count)
+                self.cache = (version, distribution)
+        low, high, percentiles = distribution
+        return {
+            'total_scores': count,
+            'highest_score': high,
+            'lowest_score': low,
+            'average_score': total / count if count else 0,
+            'unique_players': players,
+            'percentiles': percentiles,
+        }
+
+    def distribution(self, conn, count):
+        """(lowest, highest, {'p50': ..., ...}) by nearest rank from the histogram."""
+        percentiles, cumulative, low, high = {}, 0, 0, 0
+        wanted = [(p, math.ceil(p / 100 * count)) for p in PERCENTILES]
+        for score, n in conn.execute(HISTOGRAM, (self.game,)):
+            if not cumulative:
+                low = score
+            high = score
+            cumulative += n
+            while wanted and cumulative >= wanted[0][1]:
+                percentiles[f'p{wanted.pop(0)[0]}'] = score
+        return low, high, percentiles
+
+    # --- Lifecycle (nothing is written behind) ---
+    def start(self):
+        pass
+
+    def close(self):
+        self.pool.close()